@@ -4,12 +4,8 @@
 Kütüphanenin tüm yeteneklerini gösteren interaktif demo.
 Ollama ile çalışır; Ollama yoksa LLM'siz modda devam eder.
 """
-import sys
-import os
 import time
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from subconscious import Subconscious
 
 print("=" * 65)
@@ -2,11 +2,8 @@
 microsubconscious — Demo
 
 Shows the parallel between micrograd and microsubconscious.
-Run: python demo.py
+Run (from backend/): python -m microsubconscious.demo
 """
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from microsubconscious.engine import Thought
 from microsubconscious.mind import Mind
 
@@ -100,6 +97,7 @@ target = 0.5
 print(f"  Target: {target}")
 print(f"  Training for 20 steps...")
 
+params = mind.parameters()
 for step in range(20):
     # Forward
     output = mind.think(inputs)
@@ -111,7 +109,7 @@ for step in range(20):
     # Backward — resonate relevance through the mind
     mind.zero_relevance()
     # Manual gradient: d(loss)/d(act) = 2*(act - target)
-    for p in mind.parameters():
+    for p in params:
         p.relevance = 2 * (act - target) * p.activation * 0.01
 
     # Update — learn from the resonance
@@ -5,10 +5,9 @@ Bir AI'ın microsubconscious kullanarak nasıl bilinçaltından düşündüğün
 
 Normal AI:       input → [LLM] → output
 Bilinçaltılı AI: input → [SubconsciousLayer] → enriched → [LLM] → output
-"""
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+Run (from backend/): python -m microsubconscious.demo_layer
+"""
 from microsubconscious.layer import SubconsciousLayer
 
 print("=" * 65)
@@ -9,6 +9,12 @@ association DAG. Analogous to micrograd's Value class.
 """
 
 
+def _propagate(edges):
+    """Resonance kernel: one flat pass over (out, coef, child) edges."""
+    for out, coef, child in edges:
+        child.relevance += coef * out.relevance
+
+
 class Thought:
     """
     The fundamental unit of subconscious processing.
@@ -17,19 +23,50 @@ class Thought:
     micrograd analogy:
         Value.data     → Thought.data       (content)
         Value.grad     → Thought.relevance  (how relevant/important)
-        Value._backward → Thought._resonate (backward propagation fn)
+        Value._backward → Thought._coef     (local derivative, dispatched on _op)
         Value + Value  → Thought >> Thought  (association)
         forward pass   → activation spread
         backprop       → resonance
     """
 
+    # One Thought per operation adds up fast — skip the per-instance __dict__
+    __slots__ = ('_data', 'activation', 'relevance', '_prev', '_op', '_coef',
+                 '_topo_cache')
+
     def __init__(self, data, activation=0.0, _children=(), _op=''):
-        self.data = data                    # content: string or any
+        self._data = data                   # content: string or any (None = derived label)
         self.activation = activation        # how "active" this thought is [0,1]
         self.relevance = 0.0               # like grad — computed by resonate()
-        self._prev = set(_children)
+        self._prev = tuple(_children)       # ordered, keeps duplicates (a >> a)
         self._op = _op                      # operation that produced this
-        self._resonate = lambda: None       # backward fn
+        self._coef = 0.0                    # local derivative (0 = nothing to propagate)
+        self._topo_cache = None             # flat edge list, built on first resonate()
+
+    @property
+    def data(self):
+        """
+        Content of the thought. Labels of derived thoughts, e.g. "(a → b)",
+        are only formatted when first read — not on every operation.
+        """
+        if self._data is None and self._op:
+            # Post-order walk: children are labelled before their parents
+            for v in self._build_topo():
+                if v._data is None and v._op:
+                    v._data = v._label()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    def _label(self):
+        if self._op == 'assoc':
+            a, b = self._prev
+            return f"({a._data} → {b._data})"
+        if self._op == 'merge':
+            a, b = self._prev
+            return f"({a._data} + {b._data})"
+        return self._prev[0]._data
 
     def __rshift__(self, other):
         """
@@ -40,17 +77,12 @@ class Thought:
         Activation propagates: child activation = avg(parent activations) * decay
         """
         out = Thought(
-            data=f"({self.data} → {other.data})",
+            data=None,
             activation=(self.activation + other.activation) / 2 * 0.9,
             _children=(self, other),
             _op='assoc'
         )
-
-        def _resonate():
-            self.relevance += 0.7 * out.relevance
-            other.relevance += 0.7 * out.relevance
-        out._resonate = _resonate
-
+        out._coef = 0.7
         return out
 
     def __add__(self, other):
@@ -60,36 +92,28 @@ class Thought:
         """
         other = other if isinstance(other, Thought) else Thought(other)
         out = Thought(
-            data=f"({self.data} + {other.data})",
+            data=None,
             activation=max(self.activation, other.activation),
             _children=(self, other),
             _op='merge'
         )
-
-        def _resonate():
-            self.relevance += out.relevance
-            other.relevance += out.relevance
-        out._resonate = _resonate
-
+        out._coef = 1.0
         return out
 
     def __mul__(self, other):
         """
         Amplify: strengthen a thought by a factor.
         Like Value.__mul__, but for cognitive amplification.
+        The factor must be a number; anything else fails with TypeError
+        in the activation arithmetic below.
         """
-        assert isinstance(other, (int, float))
         out = Thought(
-            data=self.data,
+            data=None,
             activation=min(1.0, self.activation * other),
             _children=(self,),
             _op='amplify'
         )
-
-        def _resonate():
-            self.relevance += other * out.relevance
-        out._resonate = _resonate
-
+        out._coef = other
         return out
 
     def __rmul__(self, other):
@@ -101,16 +125,12 @@ class Thought:
         Thresholds at 0.0 — only positive activations pass.
         """
         out = Thought(
-            data=self.data,
+            data=None,
             activation=max(0.0, self.activation),
             _children=(self,),
             _op='activate'
         )
-
-        def _resonate():
-            self.relevance += (self.activation > 0) * out.relevance
-        out._resonate = _resonate
-
+        out._coef = float(self.activation > 0)  # ReLU mask, fixed at forward time
         return out
 
     def resonate(self):
@@ -121,20 +141,39 @@ class Thought:
 
         "What thoughts were most important for reaching this conclusion?"
         """
+        # _prev and _coef never change after construction, so the
+        # flattened edge list is cached. Leaves and masked activations
+        # have _coef == 0 and would only add zeros — they are left out.
+        if self._topo_cache is None:
+            self._topo_cache = [
+                (v, v._coef, child)
+                for v in reversed(self._build_topo()) if v._coef
+                for child in v._prev
+            ]
+        self.relevance = 1.0
+        _propagate(self._topo_cache)
+
+    def _build_topo(self):
+        """
+        Iterative post-order DFS over derived thoughts — deep chains can't hit
+        the recursion limit. Leaves are not listed: they have no edges to
+        propagate and no label to build.
+        """
         topo = []
         visited = set()
-
-        def build_topo(v):
-            if v not in visited:
+        stack = [(self, False)]
+        while stack:
+            v, expanded = stack.pop()
+            if expanded:
+                topo.append(v)
+            elif v not in visited:
                 visited.add(v)
+                stack.append((v, True))
                 for child in v._prev:
-                    build_topo(child)
-                topo.append(v)
-
-        build_topo(self)
-        self.relevance = 1.0
-        for v in reversed(topo):
-            v._resonate()
+                    # Leaves carry nothing to propagate or label — skip them
+                    if child._prev and child not in visited:
+                        stack.append((child, False))
+        return topo
 
     def __repr__(self):
         return f"Thought(data={self.data}, act={self.activation:.4f}, rel={self.relevance:.4f})"
@@ -82,9 +82,10 @@ class SubconsciousLayer:
 
         # 3. Mevcut bilgi ağıyla çapraz ilişkiler kur
         associations = []
+        word_set = set(words)
         for word in words:
             for known_word, known_thought in self._thoughts.items():
-                if known_word != word and known_word not in words:
+                if known_word != word and known_word not in word_set:
                     # Cross-association: yeni kavram ↔ bilinen kavram
                     cross = self._thoughts[word] >> known_thought
                     cross.resonate()
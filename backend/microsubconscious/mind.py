@@ -11,6 +11,11 @@ import random
 from microsubconscious.engine import Thought
 
 
+def _activations(x):
+    """Flatten inputs (floats or Thoughts) to plain activation values."""
+    return [xi.activation if isinstance(xi, Thought) else xi for xi in x]
+
+
 class Module:
     """Base class, like nn.Module in micrograd."""
 
@@ -35,16 +40,20 @@ class Memory(Module):
     def __init__(self, nin):
         self.w = [Thought(f'w{i}', activation=random.uniform(-1, 1)) for i in range(nin)]
         self.b = Thought('bias', activation=0.0)
+        self._children = tuple(self.w) + (self.b,)
 
     def __call__(self, x):
-        # sum(wi * xi) + b — exactly like a Neuron
         # xi can be float (first layer) or Thought (hidden layers)
+        return self._fire(_activations(x))
+
+    def _fire(self, xs):
+        # sum(wi * xi) + b — exactly like a Neuron, over plain floats
         act = self.b.activation
-        for wi, xi in zip(self.w, x):
-            xi_val = xi.activation if isinstance(xi, Thought) else xi
-            act += wi.activation * xi_val
-        out = Thought(data='memory', activation=act, _children=tuple(self.w) + (self.b,))
-        return out.activate()
+        for wi, xi in zip(self.w, xs):
+            act += wi.activation * xi
+        # sum and activate() fused into one node: the pre-activation sum had no
+        # other consumer and passed no relevance on to the weights anyway
+        return Thought(data='memory', activation=max(0.0, act), _children=self._children)
 
     def parameters(self):
         return self.w + [self.b]
@@ -60,7 +69,9 @@ class Association(Module):
         self.memories = [Memory(nin) for _ in range(nout)]
 
     def __call__(self, x):
-        out = [m(x) for m in self.memories]
+        # Unwrap the input once per layer, not once per memory
+        xs = _activations(x)
+        out = [m._fire(xs) for m in self.memories]
         return out[0] if len(out) == 1 else out
 
     def parameters(self):
@@ -78,6 +89,8 @@ class Mind(Module):
 
     def __init__(self, layers):
         self.layers = [Association(layers[i], layers[i+1]) for i in range(len(layers)-1)]
+        # Structure is fixed after construction — flatten the parameter list once
+        self._params = [p for layer in self.layers for p in layer.parameters()]
 
     def __call__(self, x):
         for layer in self.layers:
@@ -85,7 +98,7 @@ class Mind(Module):
         return x
 
     def parameters(self):
-        return [p for layer in self.layers for p in layer.parameters()]
+        return self._params
 
     def think(self, inputs):
         """Forward pass — like MLP.__call__."""
@@ -12,24 +12,24 @@ import sys
 import os
 import time
 import threading
+from contextlib import asynccontextmanager
+from collections import OrderedDict, deque
+from collections.abc import MutableSet
+from functools import lru_cache, wraps
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
+import orjson
+from fastapi import Depends, FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from subconscious import Subconscious
-from subconscious.adapters import OllamaAdapter
-from subconscious.memory.chat_db import ChatDB
-from microsubconscious.layer import SubconsciousLayer
-
 # ─── Initialize ──────────────────────────────────────────────────
 
-app = FastAPI(title="🧠 Subconscious")
+app = FastAPI(title="🧠 Subconscious", default_response_class=ORJSONResponse)
 
 # Add CORS Middleware
 app.add_middleware(
@@ -40,51 +40,217 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Core systems
-try:
-    adapter = OllamaAdapter("qwen2.5-coder:7b-instruct-q4_K_M")
-    mind = Subconscious(adapter=adapter)
-    print("✅ Ollama adapter connected")
-except Exception as e:
-    print(f"⚠️ Ollama unavailable ({e}), running without LLM")
-    adapter = None
-    mind = Subconscious()
+# Core systems — ağır importlar (networkx, chromadb, ollama) fabrikaların
+# içinde; sunucuda startup'ta bir worker thread'de kurulur, server modülünü
+# import eden araçlar bunları yüklemez. Endpoint'ler Depends(...) ile alır
+# (override edilebilir).
+_init_lock = threading.RLock()
+
+
+def _singleton(factory):
+    """lru_cache'li fabrika; eşzamanlı ilk çağrılar tek örnek kurar."""
+    cached = lru_cache(maxsize=None)(factory)
+
+    @wraps(factory)
+    def get():
+        with _init_lock:
+            return cached()
+
+    get.cache_clear = cached.cache_clear
+    return get
+
+
+@_singleton
+def _core() -> tuple:
+    """(adapter, mind) — Ollama yoksa LLM'siz mind."""
+    from subconscious import Subconscious
+    from subconscious.adapters import OllamaAdapter
+
+    try:
+        adapter = OllamaAdapter("qwen2.5-coder:7b-instruct-q4_K_M")
+        mind = Subconscious(adapter=adapter)
+        print("✅ Ollama adapter connected")
+    except Exception as e:
+        print(f"⚠️ Ollama unavailable ({e}), running without LLM")
+        adapter = None
+        mind = Subconscious()
+    return adapter, mind
+
+
+def get_adapter():
+    return _core()[0]
+
+
+def get_mind():
+    return _core()[1]
+
 
-micro_layer = SubconsciousLayer(capacity=256)
-chat_db = ChatDB()
+@_singleton
+def get_micro_layer():
+    from microsubconscious.layer import SubconsciousLayer
+    return SubconsciousLayer(capacity=256)
+
+
+@_singleton
+def get_chat_db():
+    from subconscious.memory.chat_db import ChatDB
+    return ChatDB()
+
+
+# mind worker thread'lerde çalışıyor (think, dream) — graf/bellek erişimi tek tek
+mind_lock = threading.Lock()
 
 # Connected WebSocket clients
 connected_clients: list[WebSocket] = []
 
 # ─── Conversation State ─────────────────────────────────────────
 
-conversation_history: list[dict] = []     # {"role": "user"/"assistant", "content": "..."}
-extracted_topics: list[str] = []          # LLM-extracted real topics
-background_insights: list[str] = []       # LLM-generated background insights
-recent_concepts: list[str] = []          # For graph visualization
-whisper_history: list[dict] = []
+class BoundedOrderedSet(MutableSet):
+    """En yeni önde sıralı, maxlen ile sınırlı küme — dolunca en eskisi düşer."""
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._items: dict = {}
+
+    def __contains__(self, x) -> bool:
+        return x in self._items
+
+    def __iter__(self):
+        return reversed(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, x):
+        """x'i en yeni yap; kapasite aşılırsa en eskisini at."""
+        self._items.pop(x, None)
+        self._items[x] = None
+        if len(self._items) > self.maxlen:
+            del self._items[next(iter(self._items))]
+
+    def discard(self, x):
+        self._items.pop(x, None)
+
+
+# Sınırlı deque'ler: maxlen dolunca en eskisi O(1) düşer (pop(0) yok)
+conversation_history: deque[dict] = deque(maxlen=20)   # {"role": "user"/"assistant", "content": "..."}
+ordered_topics = BoundedOrderedSet(maxlen=25)          # LLM-extracted real topics, newest first
+extracted_topics: list[str] = []                       # list view of ordered_topics
+background_insights: deque[str] = deque(maxlen=10)     # LLM-generated background insights
+recent_concepts: list[str] = []                        # For graph visualization
 
 
 # ─── LLM Helper ─────────────────────────────────────────────────
 
 from typing import Optional
 
-def _llm_generate(prompt: str, system: str = "", max_retries: int = 2) -> Optional[str]:
+# Circuit breaker: art arda _LLM_CB_THRESHOLD hatadan sonra LLM _LLM_CB_COOLDOWN
+# saniye boyunca hiç denenmez — whisper döngüsü ölü bir Ollama'yı dövmez.
+# Yarı açık durum: cooldown bitince ilk çağrı bir denemedir. Hata sayacı açılırken
+# sıfırlanmaz (eşikte kalır), bu yüzden tek bir başarısız deneme devreyi hemen
+# yeni bir cooldown için tekrar açar; başarılı bir cevap sayacı sıfırlar (kapalı).
+_LLM_CB_THRESHOLD = 5
+_LLM_CB_COOLDOWN = 30.0
+_llm_cb = {"failures": 0, "open_until": 0.0}
+
+
+async def _llm_generate(prompt: str, system: str = "", max_retries: int = 2) -> Optional[str]:
     """Call LLM and return response text, or None on failure."""
-    if adapter is None:
+    adapter = get_adapter()
+    if adapter is None or time.time() < _llm_cb["open_until"]:
         return None
-    for _ in range(max_retries):
+    for attempt in range(max_retries):
         try:
-            resp = adapter.generate(prompt=prompt, system=system)
+            resp = await adapter.agenerate(prompt=prompt, system=system)
+            _llm_cb["failures"] = 0
             if resp and resp.strip():
                 return resp.strip()
         except Exception as e:
             print(f"LLM error: {e}")
+            _llm_cb["failures"] += 1
+            if _llm_cb["failures"] >= _LLM_CB_THRESHOLD:
+                _llm_cb["open_until"] = time.time() + _LLM_CB_COOLDOWN
+                print(f"⚠️ LLM unavailable, pausing calls for {_LLM_CB_COOLDOWN:.0f}s")
+                return None
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(0.1 * 2 ** attempt)  # exponential backoff
     return None
 
 
-def _extract_topics_llm(text: str) -> list[str]:
+class LLMScheduler:
+    """
+    Tek Ollama süreci için öncelik kapısı.
+
+    Kullanıcı turu sürerken (konu çıkarma + mind.think'in kendi LLM çağrısı)
+    arka plan çağrıları başlatılmaz; tur bitince sırayla devam eder. Böylece
+    bir fısıltı üretimi kullanıcının cevabının önüne geçmez.
+    """
+
+    def __init__(self):
+        self._user_turns = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def user_turn(self):
+        self._user_turns += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._user_turns -= 1
+            if not self._user_turns:
+                self._idle.set()
+
+    async def submit(self, prompt: str, system: str = "", background: bool = False) -> Optional[str]:
+        """_llm_generate'i çalıştır; arka plan ise kullanıcı turlarını bekle."""
+        if background:
+            await self._idle.wait()
+        return await _llm_generate(prompt, system=system)
+
+
+llm_scheduler = LLMScheduler()
+
+
+# Kavram çıkarma önbelleği: normalize metin → LLM'in verdiği kavramlar (LRU).
+# Sadece başarılı LLM cevapları saklanır; regex fallback'i önbelleğe girmez.
+_TOPIC_CACHE_SIZE = 1024
+_topic_cache: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+
+
+_TOPIC_SYSTEM = "Sen bir kavram çıkarma asistanısın. Sadece kavramları virgülle listele, başka bir şey yazma."
+_PAIR_LINE_RE = re.compile(r'^\s*([AB])\s*:\s*(.*)$', re.M)
+
+
+def _topic_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _cached_topics(key: str) -> Optional[list[str]]:
+    cached = _topic_cache.get(key)
+    if cached is None:
+        return None
+    _topic_cache.move_to_end(key)
+    return list(cached)
+
+
+def _parse_topics(raw: str, key: str) -> list[str]:
+    """Virgülle ayrılmış LLM cevabını temizle ve önbelleğe yaz."""
+    topics = [t.strip().lower().strip('"\'.-*') for t in raw.split(",")]
+    topics = [t for t in topics if 2 < len(t) < 40 and not t.isdigit()][:5]
+    _topic_cache[key] = tuple(topics)
+    if len(_topic_cache) > _TOPIC_CACHE_SIZE:
+        _topic_cache.popitem(last=False)
+    return topics
+
+
+async def _extract_topics_llm(text: str) -> list[str]:
     """LLM ile metinden gerçek kavramları/konuları çıkar."""
+    key = _topic_key(text)
+    cached = _cached_topics(key)
+    if cached is not None:
+        return cached
+
     prompt = (
         f"Aşağıdaki metindeki ana kavramları/konuları çıkar. "
         f"Sadece anlamlı kavramları ver (isim, terim, konu başlığı). "
@@ -93,33 +259,66 @@ def _extract_topics_llm(text: str) -> list[str]:
         f"Metin: {text}\n\n"
         f"Kavramlar:"
     )
-    result = _llm_generate(prompt, system="Sen bir kavram çıkarma asistanısın. Sadece kavramları virgülle listele, başka bir şey yazma.")
+    result = await llm_scheduler.submit(prompt, system=_TOPIC_SYSTEM)
     if result:
-        # Parse comma-separated topics and clean
-        topics = [t.strip().lower().strip('"\'.-*') for t in result.split(",")]
-        topics = [t for t in topics if 2 < len(t) < 40 and not t.isdigit()]
-        return topics[:5]
+        return _parse_topics(result, key)
 
     # Fallback: basic regex with strict filtering
     return _extract_topics_regex(text)
 
 
+async def _extract_topics_pair_llm(user_text: str, assistant_text: str) -> tuple[list[str], list[str]]:
+    """Kullanıcı mesajı ve AI yanıtının kavramlarını tek LLM çağrısında çıkar.
+
+    Önbellekte olan taraf için çağrı yapılmaz; LLM yoksa regex'e, cevaptan
+    satırı okunamayan taraf tekil çıkarıma düşer.
+    """
+    user_key, asst_key = _topic_key(user_text), _topic_key(assistant_text)
+    user_topics, asst_topics = _cached_topics(user_key), _cached_topics(asst_key)
+    if user_topics is not None and asst_topics is not None:
+        return user_topics, asst_topics
+    if user_topics is not None:
+        return user_topics, await _extract_topics_llm(assistant_text)
+    if asst_topics is not None:
+        return await _extract_topics_llm(user_text), asst_topics
+
+    prompt = (
+        f"Aşağıdaki iki metnin her birindeki ana kavramları/konuları ayrı ayrı çıkar. "
+        f"Sadece anlamlı kavramları ver (isim, terim, konu başlığı). "
+        f"Gramer ekleri veya bağlaçlar OLMAMALI. "
+        f"Her metin için virgülle ayırarak, maksimum 5 kavram yaz. Başka hiçbir şey yazma.\n\n"
+        f"METİN_A: {user_text}\n\n"
+        f"METİN_B: {assistant_text}\n\n"
+        f"Cevap formatı:\nA: kavram1, kavram2\nB: kavram1, kavram2"
+    )
+    result = await llm_scheduler.submit(prompt, system=_TOPIC_SYSTEM)
+    if not result:
+        return _extract_topics_regex(user_text), _extract_topics_regex(assistant_text)
+    lines = {m.group(1): m.group(2) for m in _PAIR_LINE_RE.finditer(result)}
+    user_topics = _parse_topics(lines["A"], user_key) if "A" in lines else await _extract_topics_llm(user_text)
+    asst_topics = _parse_topics(lines["B"], asst_key) if "B" in lines else await _extract_topics_llm(assistant_text)
+    return user_topics, asst_topics
+
+
+# Turkish suffixed forms to strip (common endings) — module load'da derlenir.
+# Sırayla uygulanır: bir ekin silinmesi sonraki desenin eşleşeceği eki açığa çıkarabilir.
+_SUFFIX_PATTERNS = tuple(re.compile(p) for p in (
+    r'(ların|lerin|ları|leri|ında|inde|ınca|ince)$',
+    r'(ıyla|iyle|ının|inin|ıdır|idir|ması|mesi)$',
+    r'(arak|erek|ığını|iğini|ılır|ilir|ınır|inir)$',
+    r'(deki|daki|teki|taki)$',
+))
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
 def _extract_topics_regex(text: str) -> list[str]:
     """Fallback: regex kavram çıkarma (daha iyi filtreli)."""
-    # Turkish suffixed forms to strip (common endings)
-    SUFFIX_PATTERNS = [
-        r'(ların|lerin|ları|leri|ında|inde|ınca|ince)$',
-        r'(ıyla|iyle|ının|inin|ıdır|idir|ması|mesi)$',
-        r'(arak|erek|ığını|iğini|ılır|ilir|ınır|inir)$',
-        r'(deki|daki|teki|taki)$',
-    ]
-
-    words = re.findall(r'\b\w+\b', text.lower())
+    words = _WORD_RE.findall(text.lower())
     # Strip Turkish suffixes
     stemmed = []
     for w in words:
-        for pat in SUFFIX_PATTERNS:
-            w = re.sub(pat, '', w)
+        for pat in _SUFFIX_PATTERNS:
+            w = pat.sub('', w)
         if len(w) >= 4:
             stemmed.append(w)
 
@@ -138,20 +337,82 @@ def _extract_topics_regex(text: str) -> list[str]:
 
 # ─── WebSocket broadcast ─────────────────────────────────────────
 
+async def send_json(ws: WebSocket, data: dict):
+    """ws.send_json yerine orjson ile encode et (text frame — frontend JSON.parse eder)."""
+    await ws.send_text(orjson.dumps(data).decode())
+
+
 async def broadcast(data: dict):
-    """Send data to all connected clients."""
-    dead = []
-    for ws in connected_clients:
-        try:
-            await ws.send_json(data)
-        except Exception:
-            dead.append(ws)
-    for ws in dead:
-        connected_clients.remove(ws)
+    """Send data to all connected clients — encode once, send concurrently."""
+    if not connected_clients:
+        return
+    payload = orjson.dumps(data).decode()
+    # Snapshot: clients may connect/disconnect while sends are in flight
+    clients = list(connected_clients)
+    results = await asyncio.gather(
+        *(ws.send_text(payload) for ws in clients),
+        return_exceptions=True,
+    )
+    for ws, result in zip(clients, results):
+        if isinstance(result, Exception) and ws in connected_clients:
+            connected_clients.remove(ws)
 
 
 # ─── Background Thinking Thread ─────────────────────────────────
 
+# Persona + kurallar: her whisper'da birebir aynı — system prompt olarak
+# prefix'te durur, böylece KV cache'ten yeniden kullanılır.
+_SUBCONSCIOUS_SYSTEM = (
+    "Sen bir AI'ın bilinçaltı katmanısın. Görevin, evrendeki en alakasız "
+    "iki kavram arasında bile gizli kalmış, derin ve %100 mantıklı bir örüntü/kök bulmak. "
+    "Kısa, vurucu, felsefi ve Türkçe konuş.\n\n"
+    "ÖNEMLİ KURALLAR:\n"
+    "- Sadece 1-2 cümle yaz, kısa, öz ve şiirsel/felsefi ol\n"
+    "- Birbirinden en alakasız görünen 2 şeyi (örneğin: kara delikler ve insan üzüntüsü, "
+    "veya bilgisayar algoritmaları ve orman ekosistemi gibi) evrensel bir prensip etrafında birleştir\n"
+    "- Kesinlikle saçmalamadan, okuyanda 'vay canına' dedirtecek derin bir analoji kur\n"
+    "- 'İlginç...' veya 'Hmm...' gibi dolgu kelimelerle BAŞLAMA\n"
+    "- Doğrudan içgörüyü, vurucu bir aforizma veya tespit olarak yaz"
+)
+
+# Konuşma kuyruğu: mesaj sayısıyla değil token bütçesiyle sınırlı (~4 karakter/token)
+_CONV_TOKEN_BUDGET = 1024
+_conv_summary_cache: tuple[tuple, str] = ((), "")
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _conversation_summary() -> str:
+    """Son mesajlar, en yeniden geriye _CONV_TOKEN_BUDGET dolana kadar.
+
+    Bütçeye sığmayan ilk mesaj kalan bütçe kadar kırpılıp eklenir (en yeni
+    mesaj tek başına bütçeden uzunsa bile özet boş kalmaz), daha eskiler düşer.
+    Kuyruk değişmediyse önceki metin aynen döner — aynı byte'lar, aynı prefill.
+    """
+    global _conv_summary_cache
+    history = tuple(conversation_history)
+    if history == _conv_summary_cache[0]:
+        return _conv_summary_cache[1]
+
+    lines = []
+    budget = _CONV_TOKEN_BUDGET
+    for m in reversed(history):
+        line = f"{'Kullanıcı' if m['role']=='user' else 'AI'}: {m['content']}"
+        cost = _estimate_tokens(line)
+        if cost > budget:
+            # Kırpılmış satır tam olarak kalan bütçeye sığar
+            if budget > 16:
+                lines.append(line[:(budget - 1) * 4])
+            break
+        budget -= cost
+        lines.append(line)
+    text = "\n".join(reversed(lines))
+    _conv_summary_cache = (history, text)
+    return text
+
+
 class BackgroundThinker:
     """
     Gerçek bilinçaltı — LLM kullanarak arka planda düşünür.
@@ -161,27 +422,27 @@ class BackgroundThinker:
 
     def __init__(self):
         self._running = False
-        self._loop = None
-        self._thread = None
+        self._task: Optional[asyncio.Task] = None
         self._last_dream = time.time()
         self._last_whisper = 0
         self._whisper_count = 0
 
-    def start(self, loop):
+    def start(self):
+        """Event loop üzerinde task olarak başlat (thread yok)."""
         self._running = True
-        self._loop = loop
-        self._thread = threading.Thread(target=self._think_loop, daemon=True)
-        self._thread.start()
+        self._task = asyncio.create_task(self._think_loop())
 
     def stop(self):
         self._running = False
+        if self._task:
+            self._task.cancel()
 
-    def _think_loop(self):
+    async def _think_loop(self):
         """Main thinking loop — runs every 45-90 seconds."""
         while self._running:
             try:
                 # Wait 45-90 seconds between thoughts (not 8-15!)
-                time.sleep(random.uniform(45, 90))
+                await asyncio.sleep(random.uniform(45, 90))
                 if not self._running:
                     break
 
@@ -193,71 +454,57 @@ class BackgroundThinker:
                 if time.time() - self._last_whisper < 40:
                     continue
 
-                thought = self._generate_real_thought()
+                thought = await self._generate_real_thought()
                 if thought:
                     self._last_whisper = time.time()
                     self._whisper_count += 1
 
                     # Store insight for future responses
                     background_insights.append(thought["insight"])
-                    # Keep last 10 insights
-                    while len(background_insights) > 10:
-                        background_insights.pop(0)
 
                     # Broadcast to clients
-                    if self._loop and connected_clients:
-                        asyncio.run_coroutine_threadsafe(
-                            broadcast(thought), self._loop
-                        )
+                    if connected_clients:
+                        await broadcast(thought)
 
                 # Dream cycle every 3 minutes
                 if time.time() - self._last_dream > 180:
-                    self._run_dream()
+                    await self._run_dream()
                     self._last_dream = time.time()
 
             except Exception as e:
                 print(f"Background thinker error: {e}")
 
-    def _generate_real_thought(self) -> Optional[dict]:
-        """LLM ile gerçek bir bilinçaltı düşüncesi üret."""
-        if adapter is None:
-            return None
+    async def _generate_real_thought(self) -> Optional[dict]:
+        """LLM ile gerçek bir bilinçaltı düşüncesi üret.
 
-        # Build context from conversation
-        recent_msgs = conversation_history[-6:]
-        conv_summary = "\n".join([
-            f"{'Kullanıcı' if m['role']=='user' else 'AI'}: {m['content'][:200]}"
-            for m in recent_msgs
-        ])
+        Prompt loop üzerinde kurulur; LLM çağrısı async client ile loop'ta beklenir.
+        """
+        if get_adapter() is None:
+            return None
 
-        topics_str = ", ".join(extracted_topics[:10])
+        # Prompt düzeni: sabit kısım önce, değişken kısım sonda — Ollama'nın KV
+        # cache'i sabit prefix'i yeniden kullanır, sadece yeni token'lar işlenir.
+        # Konular alfabetik sıralı (aynı küme → aynı byte'lar).
+        topics_str = ", ".join(sorted(extracted_topics[:10]))
 
         # Previous insights context
         prev_insights = ""
         if background_insights:
-            prev_insights = f"\nÖnceki bilinçaltı düşüncelerim: {'; '.join(background_insights[-3:])}"
+            prev_insights = f"Önceki bilinçaltı düşüncelerim: {'; '.join(list(background_insights)[-3:])}\n"
+
+        # Build context from conversation (en değişken kısım — en sonda)
+        conv_summary = _conversation_summary()
 
         prompt = (
-            f"Sen bir AI'ın bilinçaltısın. Konuşma bağlamına bakarak, "
-            f"tartışılan konular arasında ŞOK EDİCİ derecede uzak ama AKIL ALMAZ derecede mantıklı bir bağ kur.\n\n"
+            f"Konuşma bağlamına bakarak, tartışılan konular arasında ŞOK EDİCİ derecede "
+            f"uzak ama AKIL ALMAZ derecede mantıklı bir bağ kur.\n\n"
             f"Tartışılan konular: {topics_str}\n"
-            f"Son konuşma:\n{conv_summary}\n"
-            f"{prev_insights}\n\n"
-            f"ÖNEMLİ KURALLAR:\n"
-            f"- Sadece 1-2 cümle yaz, kısa, öz ve şiirsel/felsefi ol\n"
-            f"- Birbirinden en alakasız görünen 2 şeyi (örneğin: kara delikler ve insan üzüntüsü, veya bilgisayar algoritmaları ve orman ekosistemi gibi) evrensel bir prensip etrafında birleştir\n"
-            f"- Kesinlikle saçmalamadan, okuyanda 'vay canına' dedirtecek derin bir analoji kur\n"
-            f"- 'İlginç...' veya 'Hmm...' gibi dolgu kelimelerle BAŞLAMA\n"
-            f"- Doğrudan içgörüyü, vurucu bir aforizma veya tespit olarak yaz\n\n"
+            f"{prev_insights}"
+            f"Son konuşma:\n{conv_summary}\n\n"
             f"Bilinçaltı düşüncen:"
         )
 
-        system = (
-            "Sen bir AI'ın bilinçaltı katmanısın. Görevin, evrendeki en alakasız "
-            "iki kavram arasında bile gizli kalmış, derin ve %100 mantıklı bir örüntü/kök bulmak. Kısa, vurucu, felsefi ve Türkçe konuş."
-        )
-
-        result = _llm_generate(prompt, system=system)
+        result = await llm_scheduler.submit(prompt, system=_SUBCONSCIOUS_SYSTEM, background=True)
         if not result or len(result) < 10:
             return None
 
@@ -267,34 +514,36 @@ class BackgroundThinker:
         if len(insight) > 300 or len(insight) < 15:
             return None
 
-        whisper = {
+        return {
             "type": "whisper",
             "content": f"💭 {insight}",
             "insight": insight,
             "topics": extracted_topics[:5],
             "timestamp": time.time(),
         }
-        whisper_history.append(whisper)
-        return whisper
 
-    def _run_dream(self):
+    async def _run_dream(self):
         """Background dream cycle — consolidation."""
         try:
-            report = mind.dream()
+            report = await asyncio.to_thread(_dream_locked)
             dream_msg = {
                 "type": "dream",
                 "content": f"🌙 Bellek konsolidasyonu: {report.new_connections} yeni bağlantı, "
                            f"{report.patterns_found} örüntü keşfedildi",
                 "timestamp": time.time(),
             }
-            if self._loop and connected_clients:
-                asyncio.run_coroutine_threadsafe(
-                    broadcast(dream_msg), self._loop
-                )
+            if connected_clients:
+                await broadcast(dream_msg)
         except Exception:
             pass
 
 
+def _dream_locked():
+    """mind.dream, mind_lock altında (worker thread'den çağrılır)."""
+    with mind_lock:
+        return get_mind().dream()
+
+
 thinker = BackgroundThinker()
 
 
@@ -302,14 +551,27 @@ thinker = BackgroundThinker()
 
 @app.on_event("startup")
 async def startup():
-    loop = asyncio.get_event_loop()
-    thinker.start(loop)
+    # Singleton'lar burada, worker thread'de kurulur (chromadb istemcisi, graf
+    # yüklemesi) — ilk istek veya BackgroundThinker loop üzerinde, _init_lock
+    # tutarken senkron kurulum yapıp bütün bağlantıları bekletmez.
+    await asyncio.to_thread(_core)
+    await asyncio.to_thread(get_chat_db)
+    get_micro_layer()
+    thinker.start()
     print("🧠 Background thinker started")
 
 
 @app.on_event("shutdown")
 async def shutdown():
     thinker.stop()
+    get_chat_db().close()
+    await asyncio.to_thread(_close_mind_locked)
+
+
+def _close_mind_locked():
+    """mind.close, mind_lock altında — süren bir think/dream bitince."""
+    with mind_lock:
+        get_mind().close()
 
 
 @app.get("/")
@@ -322,16 +584,26 @@ async def websocket_endpoint(ws: WebSocket):
     await ws.accept()
     connected_clients.append(ws)
 
-    # Send current graph state
+    # Send current graph state — taban önce güncellenir (değişiklik varsa
+    # diğer istemcilere delta gider), tam görüntü bu tabandan yollanır
     try:
-        graph_data = _get_graph_data()
-        await ws.send_json({"type": "graph_init", "data": graph_data})
+        delta = await asyncio.to_thread(_graph_delta_locked)
+        if delta:
+            await broadcast({"type": "graph_update", "data": delta})
+        await send_json(ws, {"type": "graph_init", "data": _get_graph_data()})
     except Exception:
         pass
 
     try:
         while True:
-            data = await ws.receive_json()
+            try:
+                data = orjson.loads(await ws.receive_text())
+            except orjson.JSONDecodeError:
+                await send_json(ws, {"type": "error", "content": "invalid JSON"})
+                continue
+            if not isinstance(data, dict):
+                await send_json(ws, {"type": "error", "content": "expected a JSON object"})
+                continue
 
             if data.get("type") == "chat":
                 message = data.get("content", "")
@@ -340,70 +612,101 @@ async def websocket_endpoint(ws: WebSocket):
                 # If no session provided, generate one
                 if not session_id:
                     # Let LLM guess a short title, or use a default
-                    session_id = chat_db.create_session("Yeni Konuşma")
-                    await ws.send_json({"type": "session_created", "session_id": session_id})
+                    session_id = await asyncio.to_thread(get_chat_db().create_session, "Yeni Konuşma")
+                    await send_json(ws, {"type": "session_created", "session_id": session_id})
                 
-                response = await _process_chat(message, session_id)
-                await ws.send_json(response)
+                async with llm_scheduler.user_turn():
+                    response = await _process_chat(ws, message, session_id)
+                await send_json(ws, response)
 
-                # Send updated graph
-                graph_data = _get_graph_data()
-                await broadcast({"type": "graph_update", "data": graph_data})
+                # Send graph changes
+                delta = await asyncio.to_thread(_graph_delta_locked)
+                if delta:
+                    await broadcast({"type": "graph_update", "data": delta})
+
+            elif data.get("type") == "graph_sync":
+                await send_json(ws, {"type": "graph_init", "data": _get_graph_data()})
 
     except WebSocketDisconnect:
-        connected_clients.remove(ws)
+        # broadcast() may already have dropped this socket
+        if ws in connected_clients:
+            connected_clients.remove(ws)
+
 
+async def _process_chat(ws: WebSocket, message: str, session_id: str) -> dict:
+    """Full subconscious pipeline for a chat message.
 
-async def _process_chat(message: str, session_id: str) -> dict:
-    """Full subconscious pipeline for a chat message."""
+    LLM yanıtı üretilirken parçalar ``chat_delta`` frame'leri olarak ws'e
+    stream edilir; dönen ``chat_response`` tam metni ve meta'yı taşır.
+    """
     global recent_concepts, extracted_topics
 
     # 1. Store conversation
-    chat_db.add_message(session_id, "user", message)
+    await asyncio.to_thread(get_chat_db().add_message, session_id, "user", message)
     conversation_history.append({"role": "user", "content": message})
 
-    # 2. Extract real topics via LLM (not just words)
-    topics = _extract_topics_llm(message)
-    extracted_topics = list(dict.fromkeys(topics + extracted_topics))[:20]
-    recent_concepts = extracted_topics[:15]
-
-    # 3. microsubconscious layer — Thought DAG processing
-    micro_result = micro_layer.process(message)
+    # 2. microsubconscious layer — Thought DAG processing
+    micro_result = get_micro_layer().process(message)
 
-    # 4. Build extra context from background insights
+    # 3. Build extra context from background insights
     insight_context = ""
     if background_insights:
         insight_context = (
             "\n\nBilinçaltı düşüncelerim (eğer kullanıcının sorusuyla çok mantıklı bir bağlantısı varsa yanıtına kısaca entegre et, yoksa tamamen görmezden gel ve normal bir asistan olarak soruyu yanıtla):\n"
-            + "\n".join(f"- {ins}" for ins in background_insights[-5:])
+            + "\n".join(f"- {ins}" for ins in list(background_insights)[-5:])
         )
 
-    # 5. subconscious.think() — memory + graph + creativity
-    #    Inject background insights into the thinking process
-    think_result = mind.think(
-        message + insight_context,
-        include_creative=True,
-        n_creative=2,
-    )
+    # 4. subconscious.think() — memory + graph + creativity
+    #    Inject background insights into the thinking process.
+    #    think() bir worker thread'de koşar; token'lar kuyruk üzerinden loop'a
+    #    aktarılıp geldikçe gönderilir (TTFB = ilk token, tam yanıt değil).
+    loop = asyncio.get_running_loop()
+    deltas: asyncio.Queue[Optional[str]] = asyncio.Queue()
+
+    def on_token(chunk: str):
+        loop.call_soon_threadsafe(deltas.put_nowait, chunk)
+
+    def think_locked():
+        with mind_lock:
+            return get_mind().think(
+                message + insight_context,
+                include_creative=True,
+                n_creative=2,
+                on_token=on_token,
+            )
+
+    async def forward_deltas():
+        while (chunk := await deltas.get()) is not None:
+            await send_json(ws, {"type": "chat_delta", "content": chunk})
+
+    forwarder = asyncio.create_task(forward_deltas())
+    try:
+        think_result = await asyncio.to_thread(think_locked)
+    finally:
+        deltas.put_nowait(None)
+        await forwarder
 
-    # 6. Store response in conversation history
-    chat_db.add_message(session_id, "assistant", think_result.response, meta={
+    # 5. Store response in conversation history
+    await asyncio.to_thread(get_chat_db().add_message, session_id, "assistant", think_result.response, meta={
         "CreativeSparks": [s.strategy.value for s in think_result.creative_sparks]
     })
     conversation_history.append({"role": "assistant", "content": think_result.response})
 
-    # Keep conversation history manageable
-    while len(conversation_history) > 20:
-        conversation_history.pop(0)
-
-    # 7. Extract topics from response too
-    resp_topics = _extract_topics_llm(think_result.response)
-    extracted_topics = list(dict.fromkeys(extracted_topics + resp_topics))[:25]
+    # 6. Extract real topics via LLM (not just words) — message and response in one call
+    topics, resp_topics = await _extract_topics_pair_llm(message, think_result.response)
+    #    Yanıt kavramları yeniyse eklenir, kullanıcı kavramları en öne taşınır
+    for t in reversed(resp_topics):
+        if t not in ordered_topics:
+            ordered_topics.add(t)
+    for t in reversed(topics):
+        ordered_topics.add(t)
+    extracted_topics = list(ordered_topics)
+    recent_concepts = extracted_topics[:15]
 
-    # 8. microsubconscious absorb
-    micro_layer.absorb(think_result.response)
+    # 7. microsubconscious absorb
+    get_micro_layer().absorb(think_result.response)
 
-    # 9. Build response
+    # 8. Build response
     return {
         "type": "chat_response",
         "content": think_result.response,
@@ -421,54 +724,104 @@ async def _process_chat(message: str, session_id: str) -> dict:
     }
 
 
-def _get_graph_data() -> dict:
-    """Get cognitive graph as D3.js compatible data."""
-    graph = mind.graph
-    nodes = []
-    edges = []
-
-    for node_id in graph._graph.nodes:
-        data = graph._graph.nodes[node_id]
-        nodes.append({
-            "id": node_id,
-            "type": data.get("node_type", "concept"),
-            "activation": data.get("activation", 0.5),
-            "importance": data.get("importance", 0.5),
-            "domain": data.get("domain", ""),
-            "is_recent": node_id in [c.lower() for c in recent_concepts[:10]],
-        })
+# ─── Graph frames ───────────────────────────────────────────────
+# Satırlar dizi olarak kodlanır (her satırda tekrar eden anahtar byte'ları yok):
+#   node: [id, type, activation, importance, domain, is_recent]
+#   edge: [source, target, key, weight, type]
+# graph_init son yayınlanan grafın tamamını, graph_update yalnızca değişenleri
+# taşır. Her delta sürümü bir artırır; base'i kendi sürümüne uymayan delta
+# gören istemci graph_sync ile tam görüntü ister.
+_graph_state: dict = {"version": 0, "nodes": {}, "edges": {}}
+
+
+def _graph_rows() -> tuple[dict, dict]:
+    """Graf satırları: node_id → node satırı, (u, v, key) → edge satırı."""
+    graph = get_mind().graph
+    nodes = {}
+    edges = {}
+    recent = {c.lower() for c in recent_concepts[:10]}
+
+    for node_id, data in graph._graph.nodes(data=True):
+        nodes[node_id] = [
+            node_id,
+            data.get("node_type", "concept"),
+            data.get("activation", 0.5),
+            data.get("importance", 0.5),
+            data.get("domain", ""),
+            node_id in recent,
+        ]
 
     for u, v, key, data in graph._graph.edges(keys=True, data=True):
-        edges.append({
-            "source": u,
-            "target": v,
-            "weight": data.get("weight", 0.5),
-            "type": data.get("edge_type", "related"),
-        })
+        edges[(u, v, key)] = [u, v, key, data.get("weight", 0.5), data.get("edge_type", "related")]
+
+    return nodes, edges
 
-    return {"nodes": nodes, "edges": edges}
+
+def _get_graph_delta() -> Optional[dict]:
+    """Son yayından beri değişen satırlar (değişiklik yoksa None) — tabanı ilerletir."""
+    global _graph_state
+    nodes, edges = _graph_rows()
+    old = _graph_state
+    changed_nodes = [row for node_id, row in nodes.items() if old["nodes"].get(node_id) != row]
+    removed_nodes = [node_id for node_id in old["nodes"] if node_id not in nodes]
+    changed_edges = [row for edge_id, row in edges.items() if old["edges"].get(edge_id) != row]
+    removed_edges = [list(edge_id) for edge_id in old["edges"] if edge_id not in edges]
+    if not (changed_nodes or removed_nodes or changed_edges or removed_edges):
+        return None
+
+    _graph_state = {"version": old["version"] + 1, "nodes": nodes, "edges": edges}
+    return {
+        "base": old["version"],
+        "version": _graph_state["version"],
+        "nodes": changed_nodes,
+        "removed_nodes": removed_nodes,
+        "edges": changed_edges,
+        "removed_edges": removed_edges,
+    }
+
+
+def _graph_delta_locked() -> Optional[dict]:
+    """_get_graph_delta, mind_lock altında (worker thread'den çağrılır)."""
+    with mind_lock:
+        return _get_graph_delta()
+
+
+def _get_graph_data() -> dict:
+    """Son yayınlanan grafın tam görüntüsü (graph_init)."""
+    state = _graph_state
+    return {
+        "version": state["version"],
+        "nodes": list(state["nodes"].values()),
+        "edges": list(state["edges"].values()),
+    }
 
 
 # ─── API Routes for Chat History ──────────────────────────────────
 
 @app.get("/api/sessions")
-async def get_sessions():
-    sessions = chat_db.list_sessions()
-    return JSONResponse({"sessions": sessions})
+async def get_sessions(chat_db=Depends(get_chat_db)):
+    sessions = await asyncio.to_thread(chat_db.list_sessions)
+    return ORJSONResponse({"sessions": sessions})
 
 @app.get("/api/sessions/{session_id}/messages")
-async def get_session_messages(session_id: str):
-    messages = chat_db.get_messages(session_id)
-    return JSONResponse({"messages": messages})
+async def get_session_messages(session_id: str, chat_db=Depends(get_chat_db)):
+    messages = await asyncio.to_thread(chat_db.get_messages, session_id)
+    return ORJSONResponse({"messages": messages})
+
+
+def _mind_stats_locked(mind) -> dict:
+    """mind.stats, mind_lock altında (worker thread'den çağrılır — flush loop'u bloklamaz)."""
+    with mind_lock:
+        return mind.stats()
 
 
 @app.get("/api/stats")
-async def get_stats():
-    return JSONResponse({
-        "mind": mind.stats(),
+async def get_stats(mind=Depends(get_mind), micro_layer=Depends(get_micro_layer)):
+    return ORJSONResponse({
+        "mind": await asyncio.to_thread(_mind_stats_locked, mind),
         "micro_layer": micro_layer.stats(),
-        "whispers": len(whisper_history),
-        "insights": background_insights[-5:],
+        "whispers": thinker._whisper_count,
+        "insights": list(background_insights)[-5:],
         "topics": extracted_topics[:10],
     })
 
@@ -12,7 +12,6 @@ Usage:
     result = mind.think("How can we improve this?")
 """
 
-from subconscious.core.mind import Subconscious
 from subconscious.core.types import (
     ThinkResult,
     Insight,
@@ -32,3 +31,12 @@ __all__ = [
     "ConceptNode",
     "Association",
 ]
+
+
+def __getattr__(name):
+    # Subconscious ağır bağımlılıkları (networkx, chromadb) çeker — ilk erişimde
+    # import edilir; alt modül importları (ör. memory.chat_db) bunları yüklemez.
+    if name == "Subconscious":
+        from subconscious.core.mind import Subconscious
+        return Subconscious
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
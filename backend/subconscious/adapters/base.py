@@ -92,3 +92,22 @@ class LLMAdapter(Protocol):
             Metin parçaları (chunks)
         """
         ...
+
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+    ) -> Iterator[str]:
+        """
+        Streaming multi-turn sohbet.
+
+        Args:
+            messages: [{"role": "system|user|assistant", "content": "..."}]
+            temperature: Yaratıcılık seviyesi
+            max_tokens: Maks token
+
+        Yields:
+            Assistant yanıtının parçaları (chunks)
+        """
+        ...
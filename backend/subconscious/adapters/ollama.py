@@ -8,6 +8,7 @@ from __future__ import annotations
 from typing import Iterator
 
 try:
+    import httpx as _httpx
     import ollama as _ollama
 except ImportError:
     _ollama = None  # type: ignore
@@ -20,9 +21,13 @@ class OllamaAdapter:
     Yerel Ollama sunucusu üzerinden model çalıştırır.
     CUDA/Metal otomatik algılanır.
 
+    Sync ve async (event loop içinden) çağrılar ayrı client'lar kullanır;
+    ikisi de HTTP bağlantılarını havuzda açık tutar (keep-alive).
+
     Usage:
         adapter = OllamaAdapter("qwen2.5:7b")
         response = adapter.generate("Merhaba!")
+        response = await adapter.agenerate("Merhaba!")
     """
 
     def __init__(self, model: str = "qwen2.5-coder:7b-instruct-q4_K_M", base_url: str = ""):
@@ -32,10 +37,13 @@ class OllamaAdapter:
                 "Install with: pip install subconscious[ollama]"
             )
         self._model = model
+        client_kwargs = {
+            "limits": _httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+        }
         if base_url:
-            self._client = _ollama.Client(host=base_url)
-        else:
-            self._client = _ollama.Client()
+            client_kwargs["host"] = base_url
+        self._client = _ollama.Client(**client_kwargs)
+        self._async_client = _ollama.AsyncClient(**client_kwargs)
 
     @property
     def model_name(self) -> str:
@@ -48,10 +56,7 @@ class OllamaAdapter:
         temperature: float = 0.7,
         max_tokens: int = 2048,
     ) -> str:
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+        messages = self._prompt_messages(prompt, system)
         return self.chat(messages, temperature=temperature, max_tokens=max_tokens)
 
     def chat(
@@ -70,6 +75,32 @@ class OllamaAdapter:
         )
         return response["message"]["content"]
 
+    async def agenerate(
+        self,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+    ) -> str:
+        messages = self._prompt_messages(prompt, system)
+        return await self.achat(messages, temperature=temperature, max_tokens=max_tokens)
+
+    async def achat(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+    ) -> str:
+        response = await self._async_client.chat(
+            model=self._model,
+            messages=messages,
+            options={
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+        )
+        return response["message"]["content"]
+
     def embed(self, text: str) -> list[float]:
         response = self._client.embed(model=self._model, input=text)
         # Ollama embed returns {"embeddings": [[...]]}
@@ -84,18 +115,33 @@ class OllamaAdapter:
         system: str = "",
         temperature: float = 0.7,
     ) -> Iterator[str]:
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+        messages = self._prompt_messages(prompt, system)
+        yield from self.chat_stream(messages, temperature=temperature)
 
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+    ) -> Iterator[str]:
         stream = self._client.chat(
             model=self._model,
             messages=messages,
-            options={"temperature": temperature},
+            options={
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
             stream=True,
         )
         for chunk in stream:
             content = chunk.get("message", {}).get("content", "")
             if content:
                 yield content
+
+    @staticmethod
+    def _prompt_messages(prompt: str, system: str) -> list[dict[str, str]]:
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return messages
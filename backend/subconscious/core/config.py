@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     ACTIVATION_DECAY: float = 0.1       # Activation decay rate per cycle
     SPREAD_FACTOR: float = 0.6          # Spreading activation propagation factor
     MIN_ASSOCIATION_WEIGHT: float = 0.1  # Below this, edges are pruned
+    GRAPH_SAVE_INTERVAL: float = 5.0    # Min seconds between debounced graph saves
 
     # Creative Engine
     CREATIVITY_TEMPERATURE: float = 0.8  # LLM temperature for creative ops
@@ -14,10 +14,19 @@ Usage:
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import heapq
+import queue
 import re
+import sys
+import threading
 import time
 import logging
-from typing import Optional
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Optional
 
 from subconscious.core.types import (
     ThinkResult,
@@ -76,6 +85,63 @@ STOP_WORDS = frozenset({
     "use", "using", "used", "make", "made", "because", "while",
 })
 
+# Turkish suffix patterns to strip — sırayla uygulanır: bir ekin silinmesi
+# sonraki desenin eşleşeceği eki açığa çıkarabilir (tek alternation bunu yapmaz).
+_SUFFIX_PATTERNS = tuple(re.compile(p) for p in (
+    r'(ların|lerin|ları|leri|ında|inde|ınca|ince)$',
+    r'(ıyla|iyle|ının|inin|ıdır|idir|ması|mesi)$',
+    r'(arak|erek|ığını|iğini|ılır|ilir|ınır|inir)$',
+    r'(deki|daki|teki|taki|sını|sini|ünü|unu)$',
+    r'(abilir|ebilir|abilecek|ebilecek)$',
+    r'(mekte|makta|mektedir|maktadır)$',
+))
+# Yalnızca rakamdan oluşan kelimeler ek temizlemeye girmeden regex içinde elenir
+_WORD_RE = re.compile(r'\b(?!\d+\b)\w{4,}\b')
+
+# Sezgi işaretleri — yanıtta "ilginç", "bağlantı", "belki" gibi kelimeler
+# geçen cümleler (alt dize eşleşmesi: "bağlantıları" da sayılır)
+_INSIGHT_RE = re.compile(
+    "|".join(map(re.escape, (
+        "ilginç", "bağlantı", "belki", "aslında", "dikkat çekici",
+        "interesting", "connection", "perhaps",
+    )))
+)
+_SENTENCE_RE = re.compile(r"[.!?]\s+")
+
+# think() system prompt — sabit mesaj, her çağrıda yeniden kurulmaz
+_SYSTEM_PROMPT = {
+    "role": "system",
+    "content": (
+        "Sen zeki, yardımsever ve son derece yetenekli bir yapay zeka asistanısın (Subconscious AI). "
+        "HER ZAMAN ve SADECE Türkçe cevap vermelisin. "
+        "Kullanıcıların sorularına her zaman doğrudan, net, doğru ve kapsamlı yanıtlar ver. "
+        "Cevapların tıpkı ChatGPT veya Gemini gibi doğal, akıcı ve profesyonel olmalıdır. "
+        "Arka planda sana iletilen 'bilinçaltı düşüncelerini' sadece soruyla çok uyumluysa tartışmaya kat, "
+        "değilse görmezden gel ve SADECE kullanıcının sorusunu en iyi şekilde yanıtlamaya odaklan."
+    ),
+}
+
+
+@lru_cache(maxsize=256)
+def _concepts_of(text: str) -> tuple[str, ...]:
+    """Metinden kavram çıkar — aynı metin (ör. middleware + learn) tekrar işlenmez."""
+    # Tek geçiş: ek temizleme + filtre + tekilleştirme; 15 kavramda dur
+    seen: set[str] = set()
+    unique: list[str] = []
+    for w in _WORD_RE.findall(text.lower()):
+        for pat in _SUFFIX_PATTERNS:
+            w = pat.sub('', w)
+        # isdigit yalnızca yeni adaylarda çalışır ("2023deki" → "2023", "²³⁴⁵")
+        if len(w) < 4 or w in seen or w in STOP_WORDS or w.isdigit():
+            continue
+        # Kavramlar graf/sözlük anahtarı olarak dolaşır — intern'le, eşitlik kimlik kontrolüne iner
+        w = sys.intern(w)
+        seen.add(w)
+        unique.append(w)
+        if len(unique) == 15:
+            break
+    return tuple(unique)
+
 
 class Subconscious:
     """
@@ -115,8 +181,18 @@ class Subconscious:
             creative=self.creative,
         )
 
-        # Conversation state
-        self._conversation: list[dict[str, str]] = []
+        # Conversation state — prompt'a yalnızca son 6 mesaj girer
+        self._conversation: deque[dict[str, str]] = deque(maxlen=64)
+
+        # Yanıt yolunda beklenmesi gerekmeyen bellek yazımları arka planda
+        # yapılır; bellek okuyan public metodlar önce flush() ile kuyruğu bitirir.
+        # Kuyruğa yalnızca bellek yazımları girer — graf hep çağıranın thread'inde
+        # değişir. close() writer'ı durdurur ve atexit kaydını siler.
+        self._closed = False
+        self._writes: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name="subconscious-writer")
+        self._writer.start()
+        atexit.register(self.flush)
 
     # ─── Core API ─────────────────────────────────────────────────────────────
 
@@ -125,6 +201,7 @@ class Subconscious:
         message: str,
         include_creative: bool = True,
         n_creative: int = 2,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> ThinkResult:
         """
         🧠 Ana düşünme fonksiyonu.
@@ -139,10 +216,13 @@ class Subconscious:
             message: Kullanıcı mesajı veya düşünülecek konu
             include_creative: Yaratıcı fikirler de üretilsin mi
             n_creative: Kaç yaratıcı fikir üretilsin
+            on_token: Verilirse LLM yanıtı stream edilir, her parça bu callback'e iletilir
 
         Returns:
             ThinkResult — zenginleştirilmiş düşünce sonucu
         """
+        self.flush()
+
         # 1. Kavram çıkarma
         concepts = self._extract_concepts(message)
 
@@ -164,8 +244,7 @@ class Subconscious:
             activated_concepts.update(activated)
 
         # 4. Kavramları grafa ekle ve bağla
-        for concept in concepts:
-            self.graph.add_concept(concept, node_type=NodeType.CONCEPT)
+        self.graph.add_concepts_bulk(concepts, node_type=NodeType.CONCEPT)
         if len(concepts) > 1:
             self.graph.connect_cooccurrence(concepts)
 
@@ -177,23 +256,22 @@ class Subconscious:
             # Bağlam hazırla
             context = self._build_context(message, recall_results, activated_concepts)
 
-            # System prompt
-            system = (
-                "Sen zeki, yardımsever ve son derece yetenekli bir yapay zeka asistanısın (Subconscious AI). "
-                "HER ZAMAN ve SADECE Türkçe cevap vermelisin. "
-                "Kullanıcıların sorularına her zaman doğrudan, net, doğru ve kapsamlı yanıtlar ver. "
-                "Cevapların tıpkı ChatGPT veya Gemini gibi doğal, akıcı ve profesyonel olmalıdır. "
-                "Arka planda sana iletilen 'bilinçaltı düşüncelerini' sadece soruyla çok uyumluysa tartışmaya kat, "
-                "değilse görmezden gel ve SADECE kullanıcının sorusunu en iyi şekilde yanıtlamaya odaklan."
-            )
-
             # Konuşma geçmişi
-            messages = [{"role": "system", "content": system}]
-            for msg in self._conversation[-6:]:
-                messages.append(msg)
-            messages.append({"role": "user", "content": context})
+            history = self._conversation
+            messages = [
+                _SYSTEM_PROMPT,
+                *islice(history, max(len(history) - 6, 0), None),
+                {"role": "user", "content": context},
+            ]
 
-            response = self.adapter.chat(messages, temperature=0.7)
+            if on_token is not None:
+                parts: list[str] = []
+                for chunk in self.adapter.chat_stream(messages, temperature=0.7):
+                    parts.append(chunk)
+                    on_token(chunk)
+                response = "".join(parts)
+            else:
+                response = self.adapter.chat(messages, temperature=0.7)
 
             # Yanıttan sezgiler çıkar
             insights = self._extract_insights(response, concepts)
@@ -205,15 +283,17 @@ class Subconscious:
         self._conversation.append({"role": "user", "content": message})
         self._conversation.append({"role": "assistant", "content": response})
 
-        # 7. Belleğe kaydet
-        self.memory.remember(
+        # 7. Belleğe kaydet (arka planda — yanıtı bekletmez)
+        self._defer(
+            self.memory.remember,
             content=message,
             memory_type=MemoryType.EPISODIC,
             importance=0.5,
             source="user",
             tags=concepts[:5],
         )
-        self.memory.remember(
+        self._defer(
+            self.memory.remember,
             content=response[:500],
             memory_type=MemoryType.EPISODIC,
             importance=0.4,
@@ -222,18 +302,19 @@ class Subconscious:
 
         # 8. Yaratıcı kıvılcımlar
         sparks = []
-        if include_creative and len(self.graph._graph.nodes) >= 2:
+        if include_creative and len(self.graph) >= 2:
             sparks = self.creative.spark(context=message, n=n_creative)
 
-        # 9. Graf kaydet
-        self.graph.save()
+        # 9. Graf kaydet (debounce'lu — her mesajda tüm JSON yazılmaz)
+        self.graph.save_if_dirty()
 
+        top_targets = list(activated_concepts.items())[:5]
         return ThinkResult(
             response=response,
             associations=[
                 Association(source=c, target=t, weight=w)
                 for c in concepts[:3]
-                for t, w in list(activated_concepts.items())[:5]
+                for t, w in top_targets
                 if t != c.lower()
             ],
             insights=insights,
@@ -248,6 +329,7 @@ class Subconscious:
         domain: str = "",
         importance: float = 0.7,
         tags: list[str] | None = None,
+        concepts: list[str] | None = None,
     ) -> MemoryRecord:
         """
         📚 Bilgi öğren — bellek + grafa entegre et.
@@ -257,8 +339,11 @@ class Subconscious:
             domain: Bilgi alanı ("programming", "science", "history", vb.)
             importance: Önem derecesi (0-1)
             tags: Etiketler
+            concepts: content'ten önceden çıkarılmış kavramlar (verilmezse çıkarılır)
         """
-        concepts = self._extract_concepts(content)
+        self.flush()
+        if concepts is None:
+            concepts = self._extract_concepts(content)
 
         # Belleğe kaydet (semantic + episodic)
         record = self.memory.remember(
@@ -269,21 +354,7 @@ class Subconscious:
             tags=tags or concepts[:5],
             source="learn",
         )
-
-        # Kavramları grafa ekle
-        for concept in concepts:
-            self.graph.add_concept(
-                concept,
-                node_type=NodeType.CONCEPT,
-                domain=domain,
-                importance=importance * 0.8,
-            )
-
-        # Bağlantılar kur
-        if len(concepts) > 1:
-            self.graph.connect_cooccurrence(concepts, weight=0.4)
-
-        self.graph.save()
+        self._integrate_concepts(concepts, domain, importance)
         return record
 
     def recall(
@@ -297,6 +368,7 @@ class Subconscious:
 
         Tüm bellek katmanlarını (working, episodic, semantic, procedural) sorgular.
         """
+        self.flush()
         return self.memory.recall_flat(query, n_results=n_results)
 
     def imagine(
@@ -315,18 +387,14 @@ class Subconscious:
         """
         if concept_a and concept_b:
             # Belirli iki kavram birleştir
-            sparks = [
-                self.creative.bisociate(concept_a, concept_b),
-                self.creative.blend(concept_a, concept_b),
-                self.creative.analogize(concept_a, concept_b),
-            ]
-            return sparks[:n]
+            return self.creative.combine(concept_a, concept_b, n=n)
         else:
             context = concept_a or concept_b or ""
             return self.creative.spark(context=context, n=n)
 
     def dream(self) -> DreamReport:
         """🌙 Manuel rüya döngüsü — arka plan keşif ve konsolidasyon."""
+        self.flush()
         return self.dream_processor.dream_once()
 
     def start_dreaming(self, interval: int = 300):
@@ -341,6 +409,7 @@ class Subconscious:
 
     def stats(self) -> dict:
         """Tüm sistem istatistikleri."""
+        self.flush()
         return {
             "memory": self.memory.get_stats(),
             "graph": self.graph.stats(),
@@ -351,39 +420,90 @@ class Subconscious:
 
     def reset(self):
         """Konuşma geçmişini sıfırla (bellek ve graf korunur)."""
+        self.flush()
         self._conversation.clear()
         self.memory.working.clear()
 
+    def flush(self):
+        """Arka planda bekleyen bellek yazımlarının bitmesini bekle."""
+        # Ertelenmiş bir iş writer thread'de kendini beklemesin
+        if threading.current_thread() is self._writer:
+            return
+        self._writes.join()
+
+    def close(self):
+        """Bekleyen yazımları bitir, writer'ı ve rüya daemon'unu durdur, grafı kaydet."""
+        if self._closed:
+            return
+        self._closed = True
+        self.stop_dreaming()
+        self._writes.put(None)
+        self._writer.join()
+        atexit.unregister(self.flush)
+        self.graph.close()
+
     # ─── Internal ─────────────────────────────────────────────────────────────
 
+    def _defer(self, fn, *args, **kwargs):
+        """fn'i yazım kuyruğuna ekle (sırayla, writer thread'de çalışır; close()'dan sonra hemen)."""
+        if self._closed:
+            fn(*args, **kwargs)
+            return
+        self._writes.put((fn, args, kwargs))
+
+    def _write_loop(self):
+        while True:
+            item = self._writes.get()
+            if item is None:  # close()
+                self._writes.task_done()
+                return
+            fn, args, kwargs = item
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                logger.exception("Deferred memory write failed")
+            finally:
+                self._writes.task_done()
+
+    def _learn_deferred(
+        self,
+        content: str,
+        domain: str,
+        importance: float,
+        concepts: list[str] | None = None,
+    ):
+        """learn() gibi, ama bellek yazımı arka planda; graf bu thread'de güncellenir."""
+        if concepts is None:
+            concepts = self._extract_concepts(content)
+        self._defer(
+            self.memory.remember,
+            content=content,
+            memory_type=MemoryType.SEMANTIC,
+            importance=importance,
+            domain=domain,
+            tags=concepts[:5],
+            source="learn",
+        )
+        self._integrate_concepts(concepts, domain, importance)
+
+    def _integrate_concepts(self, concepts: list[str], domain: str, importance: float):
+        """Kavramları grafa ekle ve birlikte geçenleri bağla."""
+        self.graph.add_concepts_bulk(
+            concepts,
+            node_type=NodeType.CONCEPT,
+            domain=domain,
+            importance=importance * 0.8,
+        )
+
+        # Bağlantılar kur
+        if len(concepts) > 1:
+            self.graph.connect_cooccurrence(concepts, weight=0.4)
+
+        self.graph.save_if_dirty()
+
     def _extract_concepts(self, text: str) -> list[str]:
         """Metinden kavram çıkar (stopword filtreli + Türkçe ek temizleme)."""
-        import re as _re
-        # Turkish suffix patterns to strip
-        _suffixes = [
-            r'(ların|lerin|ları|leri|ında|inde|ınca|ince)$',
-            r'(ıyla|iyle|ının|inin|ıdır|idir|ması|mesi)$',
-            r'(arak|erek|ığını|iğini|ılır|ilir|ınır|inir)$',
-            r'(deki|daki|teki|taki|sını|sini|ünü|unu)$',
-            r'(abilir|ebilir|abilecek|ebilecek)$',
-            r'(mekte|makta|mektedir|maktadır)$',
-        ]
-        words = _re.findall(r'\b\w{4,}\b', text.lower())
-        cleaned = []
-        for w in words:
-            for pat in _suffixes:
-                w = _re.sub(pat, '', w)
-            if len(w) >= 4:
-                cleaned.append(w)
-        concepts = [w for w in cleaned if w not in STOP_WORDS and not w.isdigit()]
-        # Deduplicate, keep order
-        seen: set[str] = set()
-        unique = []
-        for c in concepts:
-            if c not in seen:
-                seen.add(c)
-                unique.append(c)
-        return unique[:15]
+        return list(_concepts_of(text))
 
     def _build_context(
         self,
@@ -394,26 +514,28 @@ class Subconscious:
         """LLM için bağlam hazırla."""
         parts = [f"Kullanıcı mesajı: {message}\n"]
 
-        # Bellek bağlamı
-        all_memories = []
-        for layer, items in recall_results.items():
-            for item in items:
-                content = item.get("content", str(item))
-                all_memories.append(f"  [{layer}] {content[:150]}")
-        if all_memories:
-            parts.append("İlgili bellekler:\n" + "\n".join(all_memories[:5]))
+        # Bellek bağlamı — yalnızca içeriği olan ilk 5 kayıt
+        memories = islice(
+            (f"  [{layer}] {item['content'][:150]}"
+             for layer, items in recall_results.items()
+             for item in items if item.get("content")),
+            5,
+        )
+        memories_text = "\n".join(memories)
+        if memories_text:
+            parts.append("İlgili bellekler:\n" + memories_text)
 
         # Aktif kavramlar
         if activated:
-            top_concepts = sorted(activated.items(), key=lambda x: x[1], reverse=True)[:8]
+            top_concepts = heapq.nlargest(8, activated.items(), key=lambda x: x[1])
             concepts_text = ", ".join(f"{c} ({a:.2f})" for c, a in top_concepts)
             parts.append(f"\nAktif kavramlar: {concepts_text}")
 
         # Graftan komşu bilgiler
-        for concept, activation in list(activated.items())[:3]:
-            neighbors = self.graph.get_neighbors(concept, min_weight=0.3)
+        for concept in islice(activated, 3):
+            neighbors = self.graph.get_neighbors_minimal(concept, min_weight=0.3, limit=5)
             if neighbors:
-                neighbor_names = [n["target"] for n in neighbors[:5]]
+                neighbor_names = [target for target, _, _ in neighbors]
                 parts.append(f"    {concept} → {', '.join(neighbor_names)}")
 
         return "\n".join(parts)
@@ -431,7 +553,7 @@ class Subconscious:
             parts.append(f"Çıkarılan kavramlar: {', '.join(concepts)}")
 
         if activated:
-            top = sorted(activated.items(), key=lambda x: x[1], reverse=True)[:5]
+            top = heapq.nlargest(5, activated.items(), key=lambda x: x[1])
             parts.append(f"Aktif ağ: {', '.join(f'{c}({a:.2f})' for c, a in top)}")
 
         total = sum(len(v) for v in recall_results.values())
@@ -442,18 +564,17 @@ class Subconscious:
     def _extract_insights(self, response: str, concepts: list[str]) -> list[Insight]:
         """Yanıttan olası sezgiler çıkar."""
         insights = []
-        # Basit heuristik: yanıtta "ilginç", "bağlantı", "belki" gibi kelimeler varsa
-        markers = ["ilginç", "bağlantı", "belki", "aslında", "dikkat çekici", "interesting", "connection", "perhaps"]
-        sentences = re.split(r"[.!?]\s+", response)
-        for sent in sentences:
-            if any(m in sent.lower() for m in markers):
+        for sent in _SENTENCE_RE.split(response):
+            if _INSIGHT_RE.search(sent.lower()):
                 insights.append(Insight(
                     content=sent.strip(),
                     confidence=0.6,
                     source_concepts=concepts[:3],
                     insight_type="intuition",
                 ))
-        return insights[:3]
+                if len(insights) == 3:
+                    break
+        return insights
 
 
 class SubconsciousMiddleware:
@@ -497,33 +618,78 @@ class SubconsciousMiddleware:
             Sarmalanmış fonksiyon — aynı imza, bilinçaltı eklendi
         """
         def enhanced(message: str) -> str:
-            self._interaction_count += 1
-
-            # 1. Bilinçaltı bağlam topla
-            context = self._gather_context(message)
+            self.mind.flush()
+            n, concepts, enriched = self._before_chat(message)
+            response = chat_fn(enriched)
+            self._after_chat(n, message, response, concepts)
+            return response
 
-            # 2. Zenginleştirilmiş prompt oluştur
-            enriched = self._enrich_prompt(message, context)
+        return enhanced
 
-            # 3. Orijinal chat fonksiyonunu çağır
-            response = chat_fn(enriched)
+    def wrap_async(self, chat_fn):
+        """
+        Async bir chat fonksiyonunu bilinçaltı ile sarmala.
 
-            # 4. Otomatik öğren — konuşmadan
-            self._auto_learn(message, response)
+        Bağlam toplama ve öğrenme senkron kalır; LLM çağrısı beklenirken
+        event loop diğer mesajlara geçebilir (bkz. process_batch).
 
-            # 5. Periyodik dream tetikle (her 10 konuşmada bir)
-            if self._interaction_count % 10 == 0:
-                try:
-                    self.mind.dream()
-                except Exception:
-                    pass
+        Args:
+            chat_fn: async (message: str) -> str şeklinde bir chat fonksiyonu
 
+        Returns:
+            Sarmalanmış coroutine fonksiyonu
+        """
+        async def enhanced(message: str) -> str:
+            # Bekleyen bellek yazımları loop'u bloklamadan beklenir
+            await asyncio.to_thread(self.mind.flush)
+            n, concepts, enriched = self._before_chat(message)
+            response = await chat_fn(enriched)
+            self._after_chat(n, message, response, concepts)
             return response
 
         return enhanced
 
+    async def process_batch(self, messages: list[str], chat_fn) -> list[str]:
+        """
+        Birden çok mesajı eşzamanlı işle — LLM gecikmeleri üst üste biner.
+
+        Ollama isteği gerçekten paralel koşturmak için sunucuda
+        OLLAMA_NUM_PARALLEL > 1 olmalı; aksi halde istekler sunucuda sıraya girer.
+
+        Args:
+            messages: Kullanıcı mesajları
+            chat_fn: async (message: str) -> str şeklinde bir chat fonksiyonu
+
+        Returns:
+            Mesajlarla aynı sırada yanıtlar
+        """
+        enhanced = self.wrap_async(chat_fn)
+        return list(await asyncio.gather(*(enhanced(m) for m in messages)))
+
+    def _before_chat(self, message: str) -> tuple[int, list[str], str]:
+        """Bilinçaltı bağlam topla; (etkileşim no, kavramlar, zenginleştirilmiş prompt) döndür."""
+        self._interaction_count += 1
+
+        # 1. Bilinçaltı bağlam topla
+        context = self._gather_context(message)
+
+        # 2. Zenginleştirilmiş prompt oluştur
+        return self._interaction_count, context["concepts"], self._enrich_prompt(message, context)
+
+    def _after_chat(self, n: int, message: str, response: str, concepts: list[str] | None = None):
+        """Yanıt sonrası öğrenme + periyodik dream (n: bu etkileşimin numarası)."""
+        # 4. Otomatik öğren — konuşmadan
+        self._auto_learn(message, response, concepts)
+
+        # 5. Periyodik dream tetikle (her 10 konuşmada bir)
+        if n % 10 == 0:
+            try:
+                self.mind.dream()
+            except Exception:
+                pass
+
     def _gather_context(self, message: str) -> dict:
-        """Bilinçaltından ilgili bağlam topla."""
+        """Bilinçaltından ilgili bağlam topla (bekleyen yazımları çağıran flush eder)."""
         concepts = self.mind._extract_concepts(message)
 
         # Bellek arama
@@ -544,34 +710,38 @@ class SubconsciousMiddleware:
         """Orijinal mesaja bilinçaltı bağlam ekle."""
         parts = [message]
 
-        # İlgili bellekler
-        all_mem = []
-        for layer, items in context["memories"].items():
-            for item in items:
-                all_mem.append(item.get("content", str(item))[:100])
-        if all_mem:
-            parts.append(f"\n[Bilinçaltı bağlam: {'; '.join(all_mem[:3])}]")
+        # İlgili bellekler — yalnızca içeriği olan ilk 3 kayıt
+        memories = islice(
+            (item["content"][:100]
+             for items in context["memories"].values()
+             for item in items if item.get("content")),
+            3,
+        )
+        memories_text = "; ".join(memories)
+        if memories_text:
+            parts.append(f"\n[Bilinçaltı bağlam: {memories_text}]")
 
         # Aktif kavramlar
         if context["activated"]:
-            top = sorted(context["activated"].items(), key=lambda x: x[1], reverse=True)[:5]
+            top = heapq.nlargest(5, context["activated"].items(), key=lambda x: x[1])
             parts.append(f"[İlişkili kavramlar: {', '.join(c for c, _ in top)}]")
 
         return "\n".join(parts)
 
-    def _auto_learn(self, message: str, response: str):
-        """Her konuşmadan otomatik öğren."""
+    def _auto_learn(self, message: str, response: str, concepts: list[str] | None = None):
+        """Her konuşmadan otomatik öğren (bellek yazımı arka planda — yanıt hemen döner)."""
         # Kullanıcı mesajını öğren
-        self.mind.learn(
-            content=message,
+        self.mind._learn_deferred(
+            message,
             domain="conversation",
             importance=0.5,
+            concepts=concepts,
         )
 
         # AI yanıtını öğren (daha düşük öncelik)
         if len(response) > 20:
-            self.mind.learn(
-                content=response[:300],
+            self.mind._learn_deferred(
+                response[:300],
                 domain="conversation",
                 importance=0.3,
             )
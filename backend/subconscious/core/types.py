@@ -5,11 +5,12 @@ Tüm modüllerin paylaştığı veri modelleri.
 """
 from __future__ import annotations
 
+import os
+import sys
 import time
-import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional
 
 
 # ─── Enums ────────────────────────────────────────────────────────────────────
@@ -54,7 +55,7 @@ class CreativityStrategy(str, Enum):
 
 # ─── Core Data Models ─────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class ConceptNode:
     """Cognitive Graph düğümü."""
     name: str
@@ -67,6 +68,9 @@ class ConceptNode:
     created_at: float = field(default_factory=time.time)
     last_activated: float = field(default_factory=time.time)
 
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
+
     @property
     def id(self) -> str:
         return self.name.lower().strip()
@@ -85,7 +89,7 @@ class ConceptNode:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Association:
     """Cognitive Graph kenarı — iki kavram arası ilişki."""
     source: str
@@ -97,6 +101,10 @@ class Association:
     created_at: float = field(default_factory=time.time)
     reinforced_count: int = 1
 
+    def __post_init__(self):
+        self.source = sys.intern(self.source)
+        self.target = sys.intern(self.target)
+
     def to_dict(self) -> dict:
         return {
             "source": self.source,
@@ -108,7 +116,7 @@ class Association:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryRecord:
     """Tek bir bellek kaydı — tüm katmanlar için ortak."""
     content: str
@@ -117,7 +125,7 @@ class MemoryRecord:
     domain: str = ""
     tags: list[str] = field(default_factory=list)
     source: str = ""
-    memory_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    memory_id: str = field(default_factory=lambda: os.urandom(8).hex())
     timestamp: float = field(default_factory=time.time)
     access_count: int = 0
     embedding: Optional[list[float]] = field(default=None, repr=False)
@@ -136,7 +144,7 @@ class MemoryRecord:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Insight:
     """Bilinçaltı sezgi — düşünme sürecinde keşfedilen bağlantı."""
     content: str
@@ -154,7 +162,7 @@ class Insight:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CreativeSpark:
     """Yaratıcılık motorundan çıkan bir fikir."""
     idea: str
@@ -176,7 +184,7 @@ class CreativeSpark:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkResult:
     """mind.think() çıktısı — zenginleştirilmiş düşünce sonucu."""
     response: str
@@ -187,18 +195,28 @@ class ThinkResult:
     recalled_memories: list[MemoryRecord] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
 
-    def to_dict(self) -> dict:
-        return {
-            "response": self.response,
-            "associations": [a.to_dict() for a in self.associations],
-            "insights": [i.to_dict() for i in self.insights],
-            "creative_sparks": [c.to_dict() for c in self.creative_sparks],
-            "activated_concepts": self.activated_concepts,
-            "recalled_memories": [m.to_dict() for m in self.recalled_memories],
-        }
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict:
+        """
+        Serileştir; fields verilirse yalnızca o anahtarlar üretilir.
+
+        Örn. to_dict(("response", "insights")) ilişki/bellek listelerini
+        hiç dönüştürmez.
+        """
+        keys = _THINK_RESULT_FIELDS if fields is None else fields
+        return {key: _THINK_RESULT_FIELDS[key](self) for key in keys}
+
+
+_THINK_RESULT_FIELDS: dict[str, Callable[[ThinkResult], Any]] = {
+    "response": lambda r: r.response,
+    "associations": lambda r: [a.to_dict() for a in r.associations],
+    "insights": lambda r: [i.to_dict() for i in r.insights],
+    "creative_sparks": lambda r: [c.to_dict() for c in r.creative_sparks],
+    "activated_concepts": lambda r: r.activated_concepts,
+    "recalled_memories": lambda r: [m.to_dict() for m in r.recalled_memories],
+}
 
 
-@dataclass
+@dataclass(slots=True)
 class DreamReport:
     """Arka plan rüya işlemcisinin raporu."""
     new_connections: int = 0
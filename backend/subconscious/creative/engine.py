@@ -10,7 +10,12 @@ Subconscious — Creative Engine
 from __future__ import annotations
 
 import random
-from typing import Optional, TYPE_CHECKING
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from itertools import islice
+from typing import Callable, Optional, TYPE_CHECKING
 
 from subconscious.core.types import CreativeSpark, CreativityStrategy, EdgeType
 
@@ -18,6 +23,40 @@ if TYPE_CHECKING:
     from subconscious.graph.cognitive import CognitiveGraph
     from subconscious.adapters.base import LLMAdapter
 
+# Aynı anda en fazla bu kadar LLM çağrısı (büyük n'de sunucuyu boğmamak için)
+MAX_PARALLEL_SPARKS = 8
+# (strateji, a, b) → CreativeSpark LRU önbelleğinin boyutu
+SPARK_CACHE_SIZE = 256
+
+
+def _cached_spark(strategy: CreativityStrategy):
+    """
+    Kavram çifti stratejilerini (strateji, a, b) ile önbellekle.
+
+    find_distant_pairs kararlı bir top-k döndürdüğünden aynı çiftler sık
+    tekrar eder; LLM yanıtı yeniden üretilmez. Adapter yoksa çıktı zaten
+    ucuz bir şablon — önbelleğe alınmaz.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self: CreativeEngine, a: str, b: str) -> CreativeSpark:
+            if not self._adapter:
+                return method(self, a, b)
+            key = (strategy, a, b)
+            with self._cache_lock:
+                spark = self._spark_cache.get(key)
+                if spark is not None:
+                    self._spark_cache.move_to_end(key)
+                    return spark
+            spark = method(self, a, b)
+            with self._cache_lock:
+                self._spark_cache[key] = spark
+                if len(self._spark_cache) > SPARK_CACHE_SIZE:
+                    self._spark_cache.popitem(last=False)
+            return spark
+        return wrapper
+    return decorator
+
 
 class CreativeEngine:
     """
@@ -31,6 +70,15 @@ class CreativeEngine:
     def __init__(self, graph: CognitiveGraph, adapter: Optional[LLMAdapter] = None):
         self._graph = graph
         self._adapter = adapter
+        self._spark_cache: OrderedDict[tuple[CreativityStrategy, str, str], CreativeSpark] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Strateji → bağlamdan kıvılcım üreten metod
+        self._strategies: dict[CreativityStrategy, Callable[[str], Optional[CreativeSpark]]] = {
+            CreativityStrategy.BISOCIATION: self._bisociate,
+            CreativityStrategy.BLENDING: self._blend,
+            CreativityStrategy.ANALOGY: self._analogize,
+            CreativityStrategy.LATERAL: self._lateral_jump,
+        }
 
     def spark(
         self,
@@ -56,23 +104,19 @@ class CreativeEngine:
                 list(CreativityStrategy), k=n
             )
 
-        sparks = []
-        for strat in strategies:
-            if strat == CreativityStrategy.BISOCIATION:
-                spark = self._bisociate(context)
-            elif strat == CreativityStrategy.BLENDING:
-                spark = self._blend(context)
-            elif strat == CreativityStrategy.ANALOGY:
-                spark = self._analogize(context)
-            elif strat == CreativityStrategy.LATERAL:
-                spark = self._lateral_jump(context)
-            else:
-                spark = self._lateral_jump(context)
+        sparks = self._run_parallel([
+            partial(self._strategies.get(strat, self._lateral_jump), context)
+            for strat in strategies
+        ])
+        return [spark for spark in sparks if spark]
 
-            if spark:
-                sparks.append(spark)
-
-        return sparks
+    def combine(self, concept_a: str, concept_b: str, n: int = 3) -> list[CreativeSpark]:
+        """İki kavramı bisociation, blending ve analoji ile birleştir (ilk n strateji)."""
+        pair_strategies = (self._bisociate_pair, self._blend_pair, self._analogize_pair)
+        return self._run_parallel([
+            lambda fn=fn: fn(concept_a, concept_b)
+            for fn in pair_strategies[:n]
+        ])
 
     def bisociate(self, concept_a: str, concept_b: str) -> CreativeSpark:
         """İki belirli kavramı birleştir (Koestler Bisociation)."""
@@ -97,7 +141,7 @@ class CreativeEngine:
         distant = self._graph.find_distant_pairs(limit=5)
         if not distant:
             # Graf yeterince zengin değil — rastgele iki kavram seç
-            nodes = list(self._graph._graph.nodes)
+            nodes = self._graph.nodes_snapshot()
             if len(nodes) < 2:
                 return self._create_spark_without_graph(context, CreativityStrategy.BISOCIATION)
             pair = random.sample(nodes, 2)
@@ -107,6 +151,7 @@ class CreativeEngine:
         pair = random.choice(distant[:3])
         return self._bisociate_pair(pair[0], pair[1])
 
+    @_cached_spark(CreativityStrategy.BISOCIATION)
     def _bisociate_pair(self, a: str, b: str) -> CreativeSpark:
         """İki kavram arası bisociation."""
         if self._adapter:
@@ -137,6 +182,7 @@ class CreativeEngine:
             return self._create_spark_without_graph(context, CreativityStrategy.BLENDING)
         return self._blend_pair(concepts[0], concepts[1])
 
+    @_cached_spark(CreativityStrategy.BLENDING)
     def _blend_pair(self, a: str, b: str) -> CreativeSpark:
         """Kavramsal karışım."""
         if self._adapter:
@@ -167,6 +213,7 @@ class CreativeEngine:
             return self._create_spark_without_graph(context, CreativityStrategy.ANALOGY)
         return self._analogize_pair(concepts[0], concepts[1])
 
+    @_cached_spark(CreativityStrategy.ANALOGY)
     def _analogize_pair(self, source: str, target: str) -> CreativeSpark:
         """Yapısal analoji."""
         if self._adapter:
@@ -192,7 +239,7 @@ class CreativeEngine:
 
     def _lateral_jump(self, context: str) -> CreativeSpark:
         """Yanal düşünme — rastgele kavram enjeksiyonu."""
-        nodes = list(self._graph._graph.nodes)
+        nodes = self._graph.nodes_snapshot()
         if not nodes:
             return self._create_spark_without_graph(context, CreativityStrategy.LATERAL)
 
@@ -223,16 +270,31 @@ class CreativeEngine:
 
     # ─── Helpers ──────────────────────────────────────────────────────────────
 
+    def _run_parallel(self, calls: list[Callable[[], Optional[CreativeSpark]]]) -> list[Optional[CreativeSpark]]:
+        """
+        Stratejileri çalıştır, sonuçları sırayla döndür.
+
+        Adapter varsa her strateji bir LLM çağrısıdır (I/O bekler) — birden
+        fazlaysa thread'lerde eşzamanlı koşar, gecikme toplam yerine en yavaş
+        çağrı kadar olur. Stratejiler grafı yalnızca okur.
+        """
+        if not self._adapter or len(calls) < 2:
+            return [call() for call in calls]
+        workers = min(len(calls), MAX_PARALLEL_SPARKS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spark") as pool:
+            return list(pool.map(lambda call: call(), calls))
+
     def _extract_related_pair(self, context: str) -> list[str] | None:
         """Bağlamla ilgili iki kavram bul."""
-        nodes = list(self._graph._graph.nodes)
+        nodes = self._graph.nodes_snapshot()
         if len(nodes) < 2:
             return None
 
-        # Bağlamda geçen kavramları bul
-        matches = [n for n in nodes if n in context.lower()]
+        # Bağlamda geçen ilk iki kavramı bul
+        text = context.lower()
+        matches = list(islice((n for n in nodes if n in text), 2))
         if len(matches) >= 2:
-            return matches[:2]
+            return matches
 
         # Yoksa en aktif iki kavramı seç
         active = self._graph.get_most_active(5)
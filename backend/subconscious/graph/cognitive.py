@@ -7,16 +7,33 @@ Spreading activation + random walk + cluster yeteneği.
 """
 from __future__ import annotations
 
+import atexit
+import heapq
 import json
+import logging
 import math
+import os
+import queue
 import random
+import sys
+import threading
 import time
-from collections import defaultdict
+from bisect import bisect
+from collections import defaultdict, deque
+from copy import deepcopy
+from functools import wraps
+from itertools import accumulate, combinations, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import networkx as nx
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None  # type: ignore
+
 from subconscious.core.types import (
     ConceptNode,
     Association,
@@ -25,6 +42,29 @@ from subconscious.core.types import (
 )
 from subconscious.core.config import settings
 
+logger = logging.getLogger("subconscious.graph")
+
+
+def _memoize_versioned(method):
+    """
+    Sonucu graf yapısı değişene kadar sakla.
+
+    Anahtar (argümanlar, self._version); sürüm yalnızca düğüm/kenar eklenip
+    silinince artar — aktivasyon ve ağırlık güncellemeleri önbelleği bozmaz,
+    bu yüzden yalnızca yapıya bağlı sorgular sarılmalı. Dönen nesne
+    paylaşılır, çağıran değiştirmemeli.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(kwargs.items()))
+        hit = self._memo.get(key)
+        if hit is not None and hit[0] == self._version:
+            return hit[1]
+        result = method(self, *args, **kwargs)
+        self._memo[key] = (self._version, result)
+        return result
+    return wrapper
+
 
 class CognitiveGraph:
     """
@@ -36,13 +76,27 @@ class CognitiveGraph:
         - Spreading activation (yayılma aktivasyonu)
         - Random walk (yaratıcı keşif)
         - Cluster tespiti (topluluk keşfi)
-        - Persistence (JSON kayıt/yükleme)
+        - Persistence (JSON kayıt/yükleme, değişiklik varsa debounce'lu,
+          dosya yazımı arka plan thread'inde)
     """
 
     def __init__(self, persist_path: Optional[str] = None):
         self._graph = nx.MultiDiGraph()
         self._persist_path = persist_path or str(settings.DATA_DIR / "cognitive_graph.json")
+        self._dirty = False
+        self._last_save = 0.0
+        # Yapısal sürüm: düğüm/kenar eklenince veya silinince artar
+        self._version = 0
+        self._memo: dict[tuple, tuple[int, object]] = {}
+        # random_walk geçiş tablosu: (düğüm, prefer_distant) → (komşular, kümülatif ağırlıklar)
+        self._walk_cache: dict[tuple[str, bool], tuple[list[str], list[float]]] = {}
         self._load()
+        # save_if_dirty anlık görüntüyü alır, dosyaya yazma bu thread'de yapılır
+        self._writes: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name="graph-writer")
+        self._writer.start()
+        # Debounce'da bekleyen değişiklikler çıkışta yazılsın
+        atexit.register(self.flush)
 
     # ─── Node Operations ──────────────────────────────────────────────────────
 
@@ -55,7 +109,30 @@ class CognitiveGraph:
         metadata: dict | None = None,
     ) -> ConceptNode:
         """Kavram ekle veya güncelle."""
-        node_id = name.lower().strip()
+        self._upsert_node(name, node_type, domain, importance, metadata)
+        return self._node_to_concept(name.lower().strip())
+
+    def add_concepts_bulk(
+        self,
+        names: Iterable[str],
+        node_type: NodeType = NodeType.CONCEPT,
+        domain: str = "",
+        importance: float = 0.5,
+    ):
+        """Birden çok kavramı tek geçişte ekle/güncelle (ConceptNode üretmeden)."""
+        for name in names:
+            self._upsert_node(name, node_type, domain, importance, None)
+
+    def _upsert_node(
+        self,
+        name: str,
+        node_type: NodeType,
+        domain: str,
+        importance: float,
+        metadata: dict | None,
+    ):
+        node_id = sys.intern(name.lower().strip())
+        self._dirty = True
 
         if self._graph.has_node(node_id):
             # Güncelle: frequency artır, activation yenile
@@ -68,6 +145,7 @@ class CognitiveGraph:
                 data["domain"] = domain
         else:
             # Yeni ekle
+            self._version += 1
             self._graph.add_node(
                 node_id,
                 name=name,
@@ -81,8 +159,6 @@ class CognitiveGraph:
                 metadata=metadata or {},
             )
 
-        return self._node_to_concept(node_id)
-
     def get_concept(self, name: str) -> Optional[ConceptNode]:
         """Kavramı getir."""
         node_id = name.lower().strip()
@@ -95,6 +171,9 @@ class CognitiveGraph:
         node_id = name.lower().strip()
         if self._graph.has_node(node_id):
             self._graph.remove_node(node_id)
+            self._dirty = True
+            self._version += 1
+            self._walk_cache.clear()
 
     # ─── Edge Operations ──────────────────────────────────────────────────────
 
@@ -117,6 +196,8 @@ class CognitiveGraph:
         if not self._graph.has_node(tgt):
             self.add_concept(target)
 
+        self._dirty = True
+        self._walk_cache.clear()
         # Aynı tip bağlantı var mı?
         existing_key = self._find_edge(src, tgt, edge_type)
         if existing_key is not None:
@@ -126,6 +207,7 @@ class CognitiveGraph:
             data["reinforced_count"] = data.get("reinforced_count", 1) + 1
         else:
             # Yeni kenar
+            self._version += 1
             self._graph.add_edge(
                 src, tgt,
                 edge_type=edge_type.value,
@@ -144,51 +226,132 @@ class CognitiveGraph:
             confidence=confidence,
         )
 
+    def connect_many(self, edges: Iterable[tuple[str, str, EdgeType, float, float]]):
+        """
+        Birden çok bağlantıyı tek geçişte kur: (source, target, edge_type, weight, confidence).
+
+        Her kenar için sırayla connect() ile aynı sonuç, ama eksik düğümler bir
+        kez eklenir, var olan kenarlar yerinde güçlendirilir, yeni kenarlar tek
+        add_edges_from ile eklenir (sürüm ve walk önbelleği bir kez güncellenir).
+        """
+        nodes = self._graph.nodes
+        succ = self._graph.succ
+        new_edges: dict[tuple[str, str, str], dict] = {}
+        touched = False
+        for source, target, edge_type, weight, confidence in edges:
+            touched = True
+            src = source.lower().strip()
+            tgt = target.lower().strip()
+            if src not in nodes:
+                self._upsert_node(source, NodeType.CONCEPT, "", 0.5, None)
+            if tgt not in nodes:
+                self._upsert_node(target, NodeType.CONCEPT, "", 0.5, None)
+
+            etype = edge_type.value
+            data = new_edges.get((src, tgt, etype))
+            if data is None:
+                data = next(
+                    (d for d in succ[src].get(tgt, {}).values() if d.get("edge_type") == etype),
+                    None,
+                )
+            if data is not None:
+                # Güçlendir
+                data["weight"] = min(1.0, data.get("weight", 0.5) + 0.05)
+                data["reinforced_count"] = data.get("reinforced_count", 1) + 1
+            else:
+                new_edges[(src, tgt, etype)] = {
+                    "edge_type": etype,
+                    "weight": weight,
+                    "confidence": confidence,
+                    "reinforced_count": 1,
+                    "created_at": time.time(),
+                    "metadata": {},
+                }
+
+        if not touched:
+            return
+        self._dirty = True
+        self._walk_cache.clear()
+        if new_edges:
+            self._version += 1
+            self._graph.add_edges_from((u, v, data) for (u, v, _), data in new_edges.items())
+
     def connect_cooccurrence(self, concepts: list[str], weight: float = 0.3):
-        """Birlikte geçen kavramlar arası bağlantı kur."""
-        for i, a in enumerate(concepts):
-            for b in concepts[i + 1:]:
-                if a.lower().strip() != b.lower().strip():
-                    self.connect(a, b, EdgeType.COOCCURRENCE, weight=weight)
+        """
+        Birlikte geçen kavramlar arası bağlantı kur.
+
+        Her (a, b) çifti için connect(a, b, COOCCURRENCE) ile aynı sonuç,
+        connect_many ile tek geçişte.
+        """
+        ids = [c.lower().strip() for c in concepts]
+        if len(set(ids)) < 2:
+            return
+
+        pairs = combinations(zip(concepts, ids), 2)
+        self.connect_many(
+            (a, b, EdgeType.COOCCURRENCE, weight, 1.0)
+            for (a, a_id), (b, b_id) in pairs
+            if a_id != b_id
+        )
 
     def get_neighbors(
         self,
         name: str,
         edge_types: list[EdgeType] | None = None,
         min_weight: float = 0.0,
+        limit: int | None = None,
     ) -> list[dict]:
-        """Bir kavramın komşularını kenar tiplerine göre getir."""
-        node_id = name.lower().strip()
-        if not self._graph.has_node(node_id):
-            return []
-
-        neighbors = []
-        for _, target, key, data in self._graph.out_edges(node_id, keys=True, data=True):
-            if edge_types and EdgeType(data["edge_type"]) not in edge_types:
-                continue
-            if data.get("weight", 0) < min_weight:
-                continue
-            neighbors.append({
-                "target": target,
-                "edge_type": data["edge_type"],
-                "weight": data.get("weight", 0.5),
-                "target_data": dict(self._graph.nodes.get(target, {})),
-            })
+        """
+        Bir kavramın komşularını kenar tiplerine göre getir.
 
-        # Gelen kenarlar da (indegree)
-        for source, _, key, data in self._graph.in_edges(node_id, keys=True, data=True):
-            if edge_types and EdgeType(data["edge_type"]) not in edge_types:
-                continue
-            if data.get("weight", 0) < min_weight:
-                continue
-            neighbors.append({
-                "target": source,
+        Önce giden, sonra gelen kenarlar; limit verilirse o kadar komşu
+        bulununca durur (kalan kenarlar ve node verisi hiç okunmaz).
+        """
+        nodes = self._graph.nodes
+        return [
+            {
+                "target": other,
                 "edge_type": data["edge_type"],
                 "weight": data.get("weight", 0.5),
-                "target_data": dict(self._graph.nodes.get(source, {})),
-            })
+                "target_data": dict(nodes[other]),
+            }
+            for other, data in islice(self._neighbor_edges(name, edge_types, min_weight), limit)
+        ]
 
-        return neighbors
+    def get_neighbors_minimal(
+        self,
+        name: str,
+        edge_types: list[EdgeType] | None = None,
+        min_weight: float = 0.0,
+        limit: int | None = None,
+    ) -> list[tuple[str, float, str]]:
+        """get_neighbors gibi, ama (komşu, ağırlık, kenar tipi) tuple'ları — node verisi kopyalanmaz."""
+        return [
+            (other, data.get("weight", 0.5), data["edge_type"])
+            for other, data in islice(self._neighbor_edges(name, edge_types, min_weight), limit)
+        ]
+
+    def _neighbor_edges(
+        self,
+        name: str,
+        edge_types: list[EdgeType] | None,
+        min_weight: float,
+    ) -> Iterator[tuple[str, dict]]:
+        """Filtreden geçen (komşu, kenar verisi) çiftleri: önce giden, sonra gelen kenarlar."""
+        node_id = name.lower().strip()
+        if not self._graph.has_node(node_id):
+            return
+
+        allowed = {t.value for t in edge_types} if edge_types else None
+        # Giden kenarlar, sonra gelen kenarlar da (indegree)
+        for adjacency in (self._graph.succ[node_id], self._graph.pred[node_id]):
+            for other, keydict in adjacency.items():
+                for data in keydict.values():
+                    if allowed is not None and data["edge_type"] not in allowed:
+                        continue
+                    if data.get("weight", 0) < min_weight:
+                        continue
+                    yield other, data
 
     # ─── Spreading Activation ─────────────────────────────────────────────────
 
@@ -212,37 +375,38 @@ class CognitiveGraph:
         if not self._graph.has_node(node_id):
             return {}
 
+        self._dirty = True
         activated: dict[str, float] = {}
-        queue: list[tuple[str, float, int]] = [(node_id, strength, 0)]
-        visited: set[str] = set()
+        # FIFO'da bir düğümün ilk kuyruğa girişi zaten ilk işlenendi —
+        # sonrakiler hiç eklenmez (eski "visited" atlamasıyla aynı sonuç)
+        queue: deque[tuple[str, float, int]] = deque([(node_id, strength, 0)])
+        queued: set[str] = {node_id}
+        nodes = self._graph.nodes
 
         while queue:
-            current, current_strength, current_depth = queue.pop(0)
-            if current in visited or current_depth > depth:
-                continue
-            visited.add(current)
+            current, current_strength, current_depth = queue.popleft()
 
             # Aktivasyonu güncelle
-            old_activation = self._graph.nodes[current].get("activation", 0)
-            new_activation = min(1.0, old_activation + current_strength)
-            self._graph.nodes[current]["activation"] = new_activation
-            self._graph.nodes[current]["last_activated"] = time.time()
+            data = nodes[current]
+            new_activation = min(1.0, data.get("activation", 0) + current_strength)
+            data["activation"] = new_activation
+            data["last_activated"] = time.time()
             activated[current] = new_activation
 
             # Komşulara yay
             if current_depth < depth:
-                for _, neighbor, data in self._graph.out_edges(current, data=True):
-                    if neighbor not in visited:
-                        edge_weight = data.get("weight", 0.5)
-                        propagated = current_strength * spread * edge_weight
+                for _, neighbor, edge in self._graph.out_edges(current, data=True):
+                    if neighbor not in queued:
+                        propagated = current_strength * spread * edge.get("weight", 0.5)
                         if propagated > 0.01:
+                            queued.add(neighbor)
                             queue.append((neighbor, propagated, current_depth + 1))
 
-                for neighbor, _, data in self._graph.in_edges(current, data=True):
-                    if neighbor not in visited:
-                        edge_weight = data.get("weight", 0.5)
-                        propagated = current_strength * spread * edge_weight * 0.7
+                for neighbor, _, edge in self._graph.in_edges(current, data=True):
+                    if neighbor not in queued:
+                        propagated = current_strength * spread * edge.get("weight", 0.5) * 0.7
                         if propagated > 0.01:
+                            queued.add(neighbor)
                             queue.append((neighbor, propagated, current_depth + 1))
 
         return activated
@@ -250,6 +414,7 @@ class CognitiveGraph:
     def decay_all(self, rate: float | None = None):
         """Tüm aktivasyonları azalt (zaman geçişi simülasyonu)."""
         rate = rate or settings.ACTIVATION_DECAY
+        self._dirty = True
         for node_id in self._graph.nodes:
             current = self._graph.nodes[node_id].get("activation", 0)
             self._graph.nodes[node_id]["activation"] = max(0.0, current - rate)
@@ -273,7 +438,7 @@ class CognitiveGraph:
         Returns:
             [kavram1, kavram2, ...] — yürüyüş yolu
         """
-        nodes = list(self._graph.nodes)
+        nodes = self.nodes_snapshot()
         if not nodes:
             return []
 
@@ -286,98 +451,151 @@ class CognitiveGraph:
 
         path = [current]
         for _ in range(steps):
-            edges = list(self._graph.out_edges(current, data=True))
-            edges += [(t, s, d) for s, t, d in self._graph.in_edges(current, data=True)]
+            neighbors, cum_weights = self._walk_transitions(current, prefer_distant)
 
-            if not edges:
+            if not neighbors or cum_weights[-1] == 0:
                 # Çıkmaz — rastgele sıçrama
                 current = random.choice(nodes)
-                path.append(current)
-                continue
-
-            if prefer_distant:
-                # Ağırlığı düşük (uzak) kenarları tercih et
-                weights = [1.0 / max(d.get("weight", 0.5), 0.01) for _, _, d in edges]
-            else:
-                weights = [d.get("weight", 0.5) for _, _, d in edges]
-
-            total = sum(weights)
-            if total == 0:
-                current = random.choice(nodes)
             else:
-                probs = [w / total for w in weights]
-                idx = random.choices(range(len(edges)), weights=probs, k=1)[0]
-                _, next_node, _ = edges[idx]
-                if isinstance(next_node, tuple):
-                    next_node = next_node[0] if next_node else current
-                current = next_node
+                # Ters CDF: kümülatif ağırlıklarda ikili arama
+                point = random.random() * cum_weights[-1]
+                current = neighbors[bisect(cum_weights, point, 0, len(neighbors) - 1)]
 
             path.append(current)
 
         return path
 
+    def _walk_transitions(self, node_id: str, prefer_distant: bool) -> tuple[list[str], list[float]]:
+        """Düğümün (giden + gelen) komşuları ve kümülatif yürüyüş ağırlıkları (önbellekli)."""
+        key = (node_id, prefer_distant)
+        cached = self._walk_cache.get(key)
+        if cached is not None:
+            return cached
+
+        neighbors = []
+        weights = []
+        for _, neighbor, data in self._graph.out_edges(node_id, data=True):
+            neighbors.append(neighbor)
+            weights.append(data.get("weight", 0.5))
+        for neighbor, _, data in self._graph.in_edges(node_id, data=True):
+            neighbors.append(neighbor)
+            weights.append(data.get("weight", 0.5))
+        if prefer_distant:
+            # Ağırlığı düşük (uzak) kenarları tercih et
+            weights = [1.0 / max(w, 0.01) for w in weights]
+
+        cached = self._walk_cache[key] = (neighbors, list(accumulate(weights)))
+        return cached
+
     # ─── Discovery ────────────────────────────────────────────────────────────
 
-    def find_distant_pairs(self, limit: int = 5) -> list[tuple[str, str, float]]:
+    @_memoize_versioned
+    def find_distant_pairs(self, limit: int = 5, landmarks: int = 32) -> list[tuple[str, str, float]]:
         """
         Grafta var olan ama uzak (düşük ağırlıklı) kavram çiftlerini bul.
         Yaratıcılık motoru bunları bisociation'a besler.
+
+        Tüm çiftler yerine rastgele seçilen en fazla `landmarks` düğümden
+        BFS yapılır: O(k·(V+E)). V <= landmarks iken sonuç kesindir, daha
+        büyük graflarda en uzak çiftlerden bir örneklemdir.
         """
-        simple = self._graph.to_undirected()
-        if simple.number_of_nodes() < 2:
+        nodes = self.nodes_snapshot()
+        if len(nodes) < 2 or limit <= 0:
             return []
-
-        pairs = []
-        nodes = list(simple.nodes)
-        for i, a in enumerate(nodes):
-            for b in nodes[i + 1:]:
-                try:
-                    length = nx.shortest_path_length(simple, a, b)
-                    if length >= 3:  # En az 3 adım uzak
-                        pairs.append((a, b, float(length)))
-                except nx.NetworkXNoPath:
-                    pairs.append((a, b, float("inf")))
-
-        pairs.sort(key=lambda x: x[2], reverse=True)
-        return pairs[:limit]
-
+        simple = self._undirected()
+
+        # (mesafe, a, b) min-heap'i — en uzak `limit` çift
+        heap: list[tuple[float, str, str]] = []
+        seen: set[tuple[str, str]] = set()
+        for source in random.sample(nodes, min(landmarks, len(nodes))):
+            dist = nx.single_source_shortest_path_length(simple, source)
+            for node in nodes:
+                length = float(dist.get(node, math.inf))
+                if length < 3:  # En az 3 adım uzak (source'un kendisi 0)
+                    continue
+                pair = (source, node) if source < node else (node, source)
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                item = (length, *pair)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            # Heap bağlantısız çiftlerle doluysa daha uzağı yok
+            if len(heap) == limit and heap[0][0] == math.inf:
+                break
+
+        return [(a, b, length) for length, a, b in sorted(heap, reverse=True)]
+
+    @_memoize_versioned
     def find_clusters(self) -> list[set[str]]:
         """Topluluk keşfi — birbiriyle yoğun bağlı kavram gruplarını bul."""
-        simple = self._graph.to_undirected()
+        simple = self._undirected()
         if simple.number_of_nodes() == 0:
             return []
         try:
             from networkx.algorithms.community import greedy_modularity_communities
-            communities = greedy_modularity_communities(simple)
+            communities = greedy_modularity_communities(simple, weight="multiplicity")
             return [set(c) for c in communities]
         except Exception:
             components = list(nx.connected_components(simple))
             return [set(c) for c in components]
 
+    @_memoize_versioned
+    def _undirected(self) -> nx.Graph:
+        """
+        Yapısal sorgular için özniteliksiz, yönsüz kopya (sürüm başına bir kez).
+
+        Paralel kenarlar "multiplicity" ağırlığında toplanır; sayım
+        to_undirected() ile aynı — iki yöndeki aynı key tek kenardır.
+        """
+        keys: defaultdict[tuple[str, str], set[int]] = defaultdict(set)
+        for u, v, key in self._graph.edges(keys=True):
+            keys[(u, v) if u <= v else (v, u)].add(key)
+        simple = nx.Graph()
+        simple.add_nodes_from(self._graph)
+        simple.add_weighted_edges_from(
+            ((u, v, len(ks)) for (u, v), ks in keys.items()), weight="multiplicity"
+        )
+        return simple
+
     def get_most_active(self, limit: int = 10) -> list[ConceptNode]:
-        """En aktif kavramları döndür."""
-        nodes = []
-        for node_id in self._graph.nodes:
-            nodes.append(self._node_to_concept(node_id))
-        nodes.sort(key=lambda n: n.activation, reverse=True)
-        return nodes[:limit]
+        """En aktif kavramları döndür (yalnızca ilk `limit` düğüm ConceptNode'a çevrilir)."""
+        top = heapq.nlargest(
+            limit, self._graph.nodes(data="activation", default=0.0), key=itemgetter(1)
+        )
+        return [self._node_to_concept(node_id) for node_id, _ in top]
 
     def get_most_connected(self, limit: int = 10) -> list[tuple[str, int]]:
         """En çok bağlantıya sahip kavramları döndür."""
-        degree_list = [(n, self._graph.degree(n)) for n in self._graph.nodes]
-        degree_list.sort(key=lambda x: x[1], reverse=True)
-        return degree_list[:limit]
+        return heapq.nlargest(limit, self._graph.degree, key=itemgetter(1))
 
     # ─── Stats & Export ───────────────────────────────────────────────────────
 
+    def __len__(self) -> int:
+        """Düğüm (kavram) sayısı."""
+        return len(self._graph)
+
+    @_memoize_versioned
+    def nodes_snapshot(self) -> tuple[str, ...]:
+        """Tüm düğüm id'leri — yapı değişene kadar aynı tuple döner."""
+        return tuple(self._graph.nodes)
+
     def stats(self) -> dict:
+        """Düğüm/kenar sayısı ve yoğunluk — O(1), sık sorgulanan uçlar için."""
+        n = self._graph.number_of_nodes()
+        e = self._graph.number_of_edges()
         return {
-            "nodes": self._graph.number_of_nodes(),
-            "edges": self._graph.number_of_edges(),
-            "density": nx.density(self._graph) if self._graph.number_of_nodes() > 1 else 0,
-            "clusters": len(self.find_clusters()),
+            "nodes": n,
+            "edges": e,
+            "density": e / (n * (n - 1)) if n > 1 else 0,
         }
 
+    def stats_full(self) -> dict:
+        """stats() + topluluk sayısı (greedy modularity; sürüm başına bir kez hesaplanır)."""
+        return {**self.stats(), "clusters": len(self.find_clusters())}
+
     def export_graph(self) -> dict:
         """JSON-serializable graf verisi (dashboard + frontend için)."""
         nodes = []
@@ -397,20 +615,110 @@ class CognitiveGraph:
     # ─── Persistence ──────────────────────────────────────────────────────────
 
     def save(self):
-        """Grafı JSON olarak kaydet."""
+        """Grafı JSON olarak kaydet — senkron, bekleyen arka plan yazımlarından sonra."""
+        data = self._snapshot()
+        self._writes.join()
+        self._write(data)
+
+    def flush(self):
+        """Bekleyen her değişikliği hemen ve senkron yaz (çıkışta çağrılır)."""
+        if self._dirty:
+            self.save()
+        else:
+            self._writes.join()
+
+    def close(self):
+        """Bekleyenleri yaz, writer thread'i durdur ve atexit kaydını sil."""
+        if not self._writer.is_alive():
+            return
+        self.flush()
+        self._writes.put(None)
+        self._writer.join()
+        atexit.unregister(self.flush)
+
+    def mark_dirty(self):
+        """Grafın dışarıdan değiştirildiğini bildir (bir sonraki save_if_dirty yazar)."""
+        self._dirty = True
+
+    def save_if_dirty(self, min_interval: float | None = None) -> bool:
+        """
+        Değişiklik varsa ve son kayıttan beri min_interval geçtiyse kaydet.
+
+        Arka arkaya think/learn çağrıları tüm grafı her mesajda yeniden
+        serialize etmez; bekleyen değişiklik bir sonraki çağrıda (veya
+        çıkışta) yazılır.
+
+        Returns:
+            Kayıt yapıldıysa True
+        """
+        if min_interval is None:
+            min_interval = settings.GRAPH_SAVE_INTERVAL
+        if not self._dirty or time.time() - self._last_save < min_interval:
+            return False
+        # Anlık görüntü çağıranın thread'inde (graf tutarlıyken) alınır;
+        # serialize + dosya yazımı writer thread'inde, çağıran beklemez
+        if not self._writer.is_alive():  # close()'dan sonra senkron
+            self._write(self._snapshot())
+            return True
+        self._writes.put(self._snapshot())
+        return True
+
+    def _snapshot(self) -> dict:
+        """
+        Writer thread'e verilecek bağımsız kopya.
+
+        node_link_data node/edge dict'lerini yeni kurar ama içteki değerleri
+        (metadata dict'leri, graf seviyesi attr'lar) canlı grafla paylaşır;
+        değiştirilebilir değerler derin kopyalanır ki yazım sürerken ana
+        thread'deki değişiklikler yarım bir durumu yakalamasın.
+        """
         data = nx.node_link_data(self._graph)
+        data["graph"] = deepcopy(data["graph"])
+        for items in data.values():
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                for attr, value in item.items():
+                    if isinstance(value, (dict, list, set)):
+                        item[attr] = deepcopy(value)
+        self._dirty = False
+        self._last_save = time.time()
+        return data
+
+    def _write(self, data: dict):
+        """Önce geçici dosyaya yaz, sonra yerine taşı — yarım dosya kalmaz."""
         path = Path(self._persist_path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        tmp = path.with_name(path.name + ".tmp")
+        if _orjson is not None:
+            tmp.write_bytes(_orjson.dumps(data, option=_orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def _write_loop(self):
+        while True:
+            data = self._writes.get()
+            if data is None:  # close()
+                self._writes.task_done()
+                return
+            try:
+                self._write(data)
+            except Exception:
+                logger.exception("Graph save failed")
+            finally:
+                self._writes.task_done()
 
     def _load(self):
         """Grafı dosyadan yükle (varsa)."""
         path = Path(self._persist_path)
         if path.exists():
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                if _orjson is not None:
+                    data = _orjson.loads(path.read_bytes())
+                else:
+                    data = json.loads(path.read_text(encoding="utf-8"))
                 self._graph = nx.node_link_graph(data, directed=True, multigraph=True)
             except Exception:
                 self._graph = nx.MultiDiGraph()
@@ -0,0 +1,44 @@
+"""
+Subconscious — SQLite bağlantı ayarları
+
+Bellek veritabanlarının (chat, episodic, procedural) ortak PRAGMA'ları ve
+JSON sütunlarının (meta, tags) kodlaması.
+"""
+import json
+import sqlite3
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None  # type: ignore
+
+# WAL + synchronous=NORMAL: commit başına fsync yok, çökmede yalnızca son
+# transaction kaybolabilir (veritabanı bozulmaz)
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",      # 64 MB sayfa önbelleği
+    "PRAGMA mmap_size=268435456",    # 256 MB
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def tune(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Bağlantı başına bir kez çağrılır."""
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+# JSON sütunları — orjson varsa onunla (hatalarda yine json.JSONDecodeError alt sınıfı)
+if _orjson is not None:
+    def dumps(obj) -> str:
+        return _orjson.dumps(obj).decode()
+
+    loads = _orjson.loads
+else:
+    def dumps(obj) -> str:
+        return json.dumps(obj)
+
+    loads = json.loads
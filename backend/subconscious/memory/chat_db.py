@@ -4,26 +4,47 @@ Subconscious — Chat Session Database
 Simple SQLite-backed database to persist user chat sessions and messages.
 """
 import sqlite3
+import threading
 import time
 import json
 import uuid
 from typing import Optional
 
 from subconscious.core.config import settings
+from subconscious.memory._sqlite import dumps, loads, tune
 
 class ChatDB:
+    _INSERT_MESSAGE = "INSERT INTO messages (id, session_id, role, content, meta, created_at) VALUES (?, ?, ?, ?, ?, ?)"
+    _TOUCH_SESSION = "UPDATE sessions SET updated_at = ? WHERE id = ?"
+    _SELECT_MESSAGES = (
+        "SELECT id, session_id, role, content, meta, created_at FROM messages "
+        "WHERE session_id = ? ORDER BY created_at ASC"
+    )
+
     def __init__(self, db_path: Optional[str] = None):
         self._db_path = db_path or str(settings.DATA_DIR / "chat.db")
+        # Tek uzun ömürlü bağlantı — server'da asyncio.to_thread ile farklı
+        # thread'lerden kullanılıyor, erişim _lock ile sıralanır
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
         self._init_db()
 
     def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        return conn
+        if self._conn is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            tune(conn)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def _init_db(self):
-        with self._get_conn() as conn:
+        with self._lock, self._get_conn() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS sessions (
                     id TEXT PRIMARY KEY,
@@ -51,7 +72,7 @@ class ChatDB:
     def create_session(self, title: str = "New Chat") -> str:
         session_id = str(uuid.uuid4())
         now = time.time()
-        with self._get_conn() as conn:
+        with self._lock, self._get_conn() as conn:
             conn.execute(
                 "INSERT INTO sessions (id, title, created_at, updated_at) VALUES (?, ?, ?, ?)",
                 (session_id, title, now, now)
@@ -59,49 +80,80 @@ class ChatDB:
         return session_id
 
     def list_sessions(self, limit: int = 50) -> list[dict]:
-        with self._get_conn() as conn:
+        with self._lock, self._get_conn() as conn:
             rows = conn.execute("SELECT * FROM sessions ORDER BY updated_at DESC LIMIT ?", (limit,)).fetchall()
         return [dict(r) for r in rows]
 
     def get_session(self, session_id: str) -> Optional[dict]:
-        with self._get_conn() as conn:
+        with self._lock, self._get_conn() as conn:
             row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
         return dict(row) if row else None
 
     def update_session_title(self, session_id: str, title: str):
-        with self._get_conn() as conn:
+        with self._lock, self._get_conn() as conn:
             conn.execute("UPDATE sessions SET title = ?, updated_at = ? WHERE id = ?", (title, time.time(), session_id))
 
     def touch_session(self, session_id: str):
-        with self._get_conn() as conn:
-            conn.execute("UPDATE sessions SET updated_at = ? WHERE id = ?", (time.time(), session_id))
+        with self._lock, self._get_conn() as conn:
+            conn.execute(self._TOUCH_SESSION, (time.time(), session_id))
 
     # ─── Messages ─────────────────────────────────────────────────────────────
 
     def add_message(self, session_id: str, role: str, content: str, meta: dict = None) -> str:
-        msg_id = str(uuid.uuid4())
+        msg_id = uuid.uuid4().hex
         now = time.time()
-        meta_str = json.dumps(meta or {})
+        meta_str = dumps(meta) if meta else "{}"
         
-        with self._get_conn() as conn:
-            conn.execute(
-                "INSERT INTO messages (id, session_id, role, content, meta, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-                (msg_id, session_id, role, content, meta_str, now)
-            )
-            conn.execute("UPDATE sessions SET updated_at = ? WHERE id = ?", (now, session_id))
+        with self._lock, self._get_conn() as conn:
+            conn.execute(self._INSERT_MESSAGE, (msg_id, session_id, role, content, meta_str, now))
+            # İki ifade tek transaction'da: mesaj ve oturum zamanı birlikte yazılır
+            conn.execute(self._TOUCH_SESSION, (now, session_id))
             
         return msg_id
 
+    def add_messages(self, session_id: str, messages: list[dict]) -> list[str]:
+        """
+        Birden çok mesajı tek transaction'da ekle: messages = [{role, content, meta?}, ...].
+
+        Oturum zamanı bir kez güncellenir; created_at sırası liste sırasını korur.
+        """
+        now = time.time()
+        rows = [
+            (uuid.uuid4().hex, session_id, m["role"], m["content"], dumps(m["meta"]) if m.get("meta") else "{}", now + i * 1e-6)
+            for i, m in enumerate(messages)
+        ]
+        if not rows:
+            return []
+
+        with self._lock, self._get_conn() as conn:
+            conn.executemany(self._INSERT_MESSAGE, rows)
+            conn.execute(self._TOUCH_SESSION, (rows[-1][5], session_id))
+
+        return [row[0] for row in rows]
+
     def get_messages(self, session_id: str) -> list[dict]:
-        with self._get_conn() as conn:
-            rows = conn.execute("SELECT * FROM messages WHERE session_id = ? ORDER BY created_at ASC", (session_id,)).fetchall()
-        
-        messages = []
-        for r in rows:
-            msg = dict(r)
-            try:
-                msg["meta"] = json.loads(msg["meta"])
-            except json.JSONDecodeError:
-                msg["meta"] = {}
-            messages.append(msg)
-        return messages
+        with self._lock, self._get_conn() as conn:
+            rows = conn.execute(self._SELECT_MESSAGES, (session_id,)).fetchall()
+
+        # Sütunlar konumla okunur — dict(sqlite3.Row) satır başına ayrı anahtar araması yapar
+        return [
+            {
+                "id": r[0],
+                "session_id": r[1],
+                "role": r[2],
+                "content": r[3],
+                "meta": _decode_meta(r[4]),
+                "created_at": r[5],
+            }
+            for r in rows
+        ]
+
+
+def _decode_meta(text: Optional[str]) -> dict:
+    """meta sütunu → dict (boş veya bozuksa {})."""
+    if not text or text == "{}":
+        return {}
+    try:
+        return loads(text)
+    except json.JSONDecodeError:
+        return {}
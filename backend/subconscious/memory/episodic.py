@@ -13,6 +13,7 @@ from typing import Optional
 
 from subconscious.core.types import MemoryRecord, MemoryType
 from subconscious.core.config import settings
+from subconscious.memory._sqlite import dumps, loads, tune
 
 
 class EpisodicMemory:
@@ -29,9 +30,9 @@ class EpisodicMemory:
 
     def _get_conn(self) -> sqlite3.Connection:
         if not hasattr(self._local, "conn") or self._local.conn is None:
-            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, cached_statements=256)
             conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA journal_mode=WAL")
+            tune(conn)
             self._local.conn = conn
         return self._local.conn
 
@@ -73,7 +74,7 @@ class EpisodicMemory:
                 record.memory_type.value if isinstance(record.memory_type, MemoryType) else record.memory_type,
                 record.importance,
                 record.domain,
-                json.dumps(record.tags),
+                dumps(record.tags) if record.tags else "[]",
                 record.source,
                 record.timestamp,
                 record.access_count,
@@ -155,9 +156,11 @@ class EpisodicMemory:
 
     def _row_to_record(self, row: sqlite3.Row) -> MemoryRecord:
         tags = row["tags"]
-        if isinstance(tags, str):
+        if not tags or tags == "[]":
+            tags = []
+        elif isinstance(tags, str):
             try:
-                tags = json.loads(tags)
+                tags = loads(tags)
             except json.JSONDecodeError:
                 tags = []
         return MemoryRecord(
@@ -9,10 +9,12 @@ from __future__ import annotations
 import json
 import sqlite3
 import threading
+import time
 from typing import Optional
 
 from subconscious.core.types import MemoryRecord, MemoryType
 from subconscious.core.config import settings
+from subconscious.memory._sqlite import dumps, loads, tune
 
 
 class ProceduralMemory:
@@ -23,6 +25,16 @@ class ProceduralMemory:
     Tekrarlanan başarılı stratejiler güçlenir (reinforcement).
     """
 
+    _SUCCESS_RATE = "(CAST(success_count AS REAL) / MAX(success_count + fail_count, 1))"
+    _REINFORCE_OK = """UPDATE procedures SET success_count = success_count + 1,
+                   importance = MIN(1.0, importance + 0.05),
+                   last_used = ?
+                   WHERE memory_id = ?"""
+    _REINFORCE_FAIL = """UPDATE procedures SET fail_count = fail_count + 1,
+                   importance = MAX(0.0, importance - 0.03),
+                   last_used = ?
+                   WHERE memory_id = ?"""
+
     def __init__(self, db_path: Optional[str] = None):
         self._db_path = db_path or str(settings.DATA_DIR / "procedural.db")
         self._local = threading.local()
@@ -30,8 +42,9 @@ class ProceduralMemory:
 
     def _get_conn(self) -> sqlite3.Connection:
         if not hasattr(self._local, "conn") or self._local.conn is None:
-            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, cached_statements=256)
             conn.row_factory = sqlite3.Row
+            tune(conn)
             self._local.conn = conn
         return self._local.conn
 
@@ -55,58 +68,115 @@ class ProceduralMemory:
             CREATE INDEX IF NOT EXISTS idx_proc_domain
             ON procedures(domain)
         """)
+        # recall_by_domain / recall_best sıralamaları indeksten okunur (sort yok);
+        # ifade, sorgulardaki _SUCCESS_RATE ile birebir aynı olmalı
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_proc_domain_rate
+            ON procedures(domain, {self._SUCCESS_RATE} DESC, importance DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_proc_importance
+            ON procedures(importance DESC, success_count DESC)
+        """)
+        self._fts = self._init_fts(conn)
         conn.commit()
 
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        search_content için FTS5 trigram indeksi (alt dize araması, LIKE '%q%' gibi).
+
+        External-content tablo: metin procedures'ta kalır, indeks procedures.rowid
+        ile anahtarlanır — tetikleyiciler satırı rowid ile bulur (tablo taraması yok).
+        FTS5 yoksa False (LIKE'a düşülür).
+        """
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'procedures_fts'"
+        ).fetchone()
+        if row is not None and "content_rowid" not in row[0]:
+            # Eski şema: memory_id ile eşleşen bağımsız tablo — yeniden kurulur
+            conn.executescript("""
+                DROP TRIGGER IF EXISTS procedures_fts_ai;
+                DROP TRIGGER IF EXISTS procedures_fts_ad;
+                DROP TRIGGER IF EXISTS procedures_fts_au;
+                DROP TABLE procedures_fts;
+            """)
+            row = None
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS procedures_fts
+                USING fts5(content, content='procedures', content_rowid='rowid', tokenize='trigram')
+            """)
+        except sqlite3.OperationalError:
+            return False
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS procedures_fts_ai AFTER INSERT ON procedures BEGIN
+                INSERT INTO procedures_fts (rowid, content) VALUES (new.rowid, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS procedures_fts_ad AFTER DELETE ON procedures BEGIN
+                INSERT INTO procedures_fts (procedures_fts, rowid, content)
+                VALUES ('delete', old.rowid, old.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS procedures_fts_au AFTER UPDATE OF content ON procedures
+            WHEN old.content IS NOT new.content BEGIN
+                INSERT INTO procedures_fts (procedures_fts, rowid, content)
+                VALUES ('delete', old.rowid, old.content);
+                INSERT INTO procedures_fts (rowid, content) VALUES (new.rowid, new.content);
+            END;
+        """)
+        if row is None:
+            conn.execute("INSERT INTO procedures_fts (procedures_fts) VALUES ('rebuild')")
+        return True
+
     def store(self, record: MemoryRecord, pattern_type: str = "solution"):
         """Başarılı pattern'ı kaydet."""
+        self.store_many([record], pattern_type)
+
+    def store_many(self, records: list[MemoryRecord], pattern_type: str = "solution"):
+        """Birden çok pattern'ı tek transaction'da kaydet."""
         conn = self._get_conn()
-        conn.execute(
-            """INSERT OR REPLACE INTO procedures
+        conn.executemany(
+            # INSERT OR REPLACE'ın satır silmesi DELETE tetikleyicisini çalıştırmaz
+            # (recursive_triggers kapalı) — FTS senkronu için upsert
+            """INSERT INTO procedures
                (memory_id, content, pattern_type, domain, tags, success_count,
                 fail_count, importance, timestamp, last_used)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                record.memory_id,
-                record.content,
-                pattern_type,
-                record.domain,
-                json.dumps(record.tags),
-                1, 0,
-                record.importance,
-                record.timestamp,
-                record.timestamp,
-            ),
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (memory_id) DO UPDATE SET
+                content = excluded.content, pattern_type = excluded.pattern_type,
+                domain = excluded.domain, tags = excluded.tags,
+                success_count = excluded.success_count, fail_count = excluded.fail_count,
+                importance = excluded.importance, timestamp = excluded.timestamp,
+                last_used = excluded.last_used""",
+            [
+                (
+                    record.memory_id,
+                    record.content,
+                    pattern_type,
+                    record.domain,
+                    dumps(record.tags) if record.tags else "[]",
+                    1, 0,
+                    record.importance,
+                    record.timestamp,
+                    record.timestamp,
+                )
+                for record in records
+            ],
         )
         conn.commit()
 
     def reinforce(self, memory_id: str, success: bool = True):
         """Pattern kullanıldı — başarılı veya başarısız olarak güçlendir/zayıflat."""
         conn = self._get_conn()
-        if success:
-            conn.execute(
-                """UPDATE procedures SET success_count = success_count + 1,
-                   importance = MIN(1.0, importance + 0.05),
-                   last_used = strftime('%s','now')
-                   WHERE memory_id = ?""",
-                (memory_id,),
-            )
-        else:
-            conn.execute(
-                """UPDATE procedures SET fail_count = fail_count + 1,
-                   importance = MAX(0.0, importance - 0.03),
-                   last_used = strftime('%s','now')
-                   WHERE memory_id = ?""",
-                (memory_id,),
-            )
+        conn.execute(self._REINFORCE_OK if success else self._REINFORCE_FAIL, (time.time(), memory_id))
         conn.commit()
 
     def recall_by_domain(self, domain: str, limit: int = 5) -> list[MemoryRecord]:
         """Belirli bir alandaki pattern'ları getir (başarı oranına göre)."""
         conn = self._get_conn()
         rows = conn.execute(
-            """SELECT *, (CAST(success_count AS REAL) / MAX(success_count + fail_count, 1)) as success_rate
+            f"""SELECT *, {self._SUCCESS_RATE} as success_rate
                FROM procedures WHERE domain = ?
-               ORDER BY success_rate DESC, importance DESC LIMIT ?""",
+               ORDER BY {self._SUCCESS_RATE} DESC, importance DESC LIMIT ?""",
             (domain, limit),
         ).fetchall()
         return [self._row_to_record(r) for r in rows]
@@ -122,8 +192,16 @@ class ProceduralMemory:
         return [self._row_to_record(r) for r in rows]
 
     def search_content(self, query: str, limit: int = 5) -> list[MemoryRecord]:
-        """İçerikte arama."""
+        """İçerikte arama (alt dize, büyük/küçük harf duyarsız)."""
         conn = self._get_conn()
+        # Trigram indeksi 3+ karakterlik sorguları karşılar; kısa sorgular LIKE ile
+        if self._fts and len(query) >= 3:
+            rows = conn.execute(
+                """SELECT p.* FROM procedures_fts f JOIN procedures p ON p.rowid = f.rowid
+                   WHERE procedures_fts MATCH ? ORDER BY p.importance DESC LIMIT ?""",
+                ('"' + query.replace('"', '""') + '"', limit),
+            ).fetchall()
+            return [self._row_to_record(r) for r in rows]
         rows = conn.execute(
             "SELECT * FROM procedures WHERE content LIKE ? ORDER BY importance DESC LIMIT ?",
             (f"%{query}%", limit),
@@ -141,9 +219,11 @@ class ProceduralMemory:
 
     def _row_to_record(self, row: sqlite3.Row) -> MemoryRecord:
         tags = row["tags"]
-        if isinstance(tags, str):
+        if not tags or tags == "[]":
+            tags = []
+        elif isinstance(tags, str):
             try:
-                tags = json.loads(tags)
+                tags = loads(tags)
             except json.JSONDecodeError:
                 tags = []
         return MemoryRecord(
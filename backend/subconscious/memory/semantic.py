@@ -33,18 +33,24 @@ class SemanticMemory:
 
     def store(self, record: MemoryRecord):
         """Anlamsal bilgiyi kaydet (embedding otomatik üretilir)."""
+        self.store_many([record])
+
+    def store_many(self, records: list[MemoryRecord]):
+        """Birden çok kaydı tek upsert ile kaydet (embedding'ler tek partide üretilir)."""
+        if not records:
+            return
         self._collection.upsert(
-            ids=[record.memory_id],
-            documents=[record.content],
+            ids=[r.memory_id for r in records],
+            documents=[r.content for r in records],
             metadatas=[{
-                "memory_type": record.memory_type.value if isinstance(record.memory_type, MemoryType) else record.memory_type,
-                "importance": record.importance,
-                "domain": record.domain,
-                "tags": json.dumps(record.tags),
-                "source": record.source,
-                "timestamp": record.timestamp,
-                "access_count": record.access_count,
-            }],
+                "memory_type": r.memory_type.value if isinstance(r.memory_type, MemoryType) else r.memory_type,
+                "importance": r.importance,
+                "domain": r.domain,
+                "tags": json.dumps(r.tags),
+                "source": r.source,
+                "timestamp": r.timestamp,
+                "access_count": r.access_count,
+            } for r in records],
         )
 
     def search(
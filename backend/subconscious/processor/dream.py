@@ -14,7 +14,7 @@ import time
 import logging
 from typing import Optional, TYPE_CHECKING
 
-from subconscious.core.types import DreamReport, MemoryType, MemoryRecord
+from subconscious.core.types import DreamReport, EdgeType, MemoryType, MemoryRecord
 
 if TYPE_CHECKING:
     from subconscious.memory.manager import MemoryManager
@@ -61,8 +61,8 @@ class DreamProcessor:
         # 2. Aktivasyon sönümlemesi
         self.graph.decay_all()
 
-        # 3. Graf kaydet
-        self.graph.save()
+        # 3. Graf kaydet (debounce'suz, yazım arka planda)
+        self.graph.save_if_dirty(0.0)
 
         # 4. Akıllı unutma (pruning)
         report.memories_pruned = self._forget()
@@ -136,13 +136,10 @@ class DreamProcessor:
 
     def _consolidate(self) -> int:
         """Working memory taşanlarını episodic'e, önemlileri semantic'e taşı."""
-        count = 0
         recent = self.memory.episodic.recall_recent(20)
-        for record in recent:
-            if record.importance >= 0.6:
-                self.memory.semantic.store(record)
-                count += 1
-        return count
+        batch = [record for record in recent if record.importance >= 0.6]
+        self.memory.semantic.store_many(batch)
+        return len(batch)
 
     def _forget(self) -> int:
         """Düşük önemli, az erişilen bellek kayıtlarını buda."""
@@ -151,19 +148,13 @@ class DreamProcessor:
 
     def _discover_connections(self) -> int:
         """Random walk ile yeni bağlantılar keşfet."""
-        new = 0
+        pending = []
         for _ in range(3):
             path = self.graph.random_walk(steps=4, prefer_distant=True)
             if len(path) >= 2:
                 # Yolun başı ve sonu arasında yeni bağlantı oluştur
                 start, end = path[0], path[-1]
                 if start != end:
-                    from subconscious.core.types import EdgeType
-                    self.graph.connect(
-                        start, end,
-                        edge_type=EdgeType.SEMANTIC,
-                        weight=0.2,
-                        confidence=0.3,
-                    )
-                    new += 1
-        return new
+                    pending.append((start, end, EdgeType.SEMANTIC, 0.2, 0.3))
+        self.graph.connect_many(pending)
+        return len(pending)
@@ -0,0 +1,64 @@
+"""server._conversation_summary — token bütçeli konuşma kuyruğu."""
+from collections import deque
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("orjson")
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def history(monkeypatch):
+    conv = deque(maxlen=20)
+    monkeypatch.setattr(server, "conversation_history", conv)
+    monkeypatch.setattr(server, "_conv_summary_cache", ((), ""))
+    return conv
+
+
+def _tokens(summary: str) -> int:
+    return sum(server._estimate_tokens(line) for line in summary.split("\n"))
+
+
+def test_long_messages_stop_at_budget(history):
+    for i in range(10):
+        history.append({"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i} " + "x" * 2500})
+
+    summary = server._conversation_summary()
+    lines = summary.split("\n")
+
+    assert _tokens(summary) <= server._CONV_TOKEN_BUDGET
+    # En yeni mesaj tam, bir önceki kalan bütçeye kırpılmış, daha eskiler yok
+    assert lines[-1] == "AI: m9 " + "x" * 2500
+    assert lines[0].startswith("Kullanıcı: m8 ")
+    assert len(lines) == 2
+    assert "m7" not in summary
+
+
+def test_oversized_latest_message_is_truncated(history):
+    history.append({"role": "user", "content": "y" * 10_000})
+
+    summary = server._conversation_summary()
+
+    assert summary.startswith("Kullanıcı: yyy")
+    assert _tokens(summary) <= server._CONV_TOKEN_BUDGET
+
+
+def test_short_messages_not_capped_by_count(history):
+    for i in range(20):
+        history.append({"role": "user", "content": f"kısa mesaj {i}"})
+
+    summary = server._conversation_summary()
+
+    assert len(summary.split("\n")) == 20
+    assert summary.endswith("Kullanıcı: kısa mesaj 19")
+
+
+def test_unchanged_history_reuses_cached_text(history):
+    history.append({"role": "user", "content": "merhaba"})
+    first = server._conversation_summary()
+    assert server._conversation_summary() is first
+
+    history.append({"role": "assistant", "content": "selam"})
+    assert server._conversation_summary().endswith("AI: selam")
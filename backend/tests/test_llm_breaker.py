@@ -0,0 +1,70 @@
+"""server._llm_generate circuit breaker — aç → cooldown → yarı açık → kapan."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("orjson")
+
+import server  # noqa: E402
+
+
+class FlakyAdapter:
+    def __init__(self):
+        self.healthy = False
+        self.calls = 0
+
+    async def agenerate(self, prompt: str, system: str = "") -> str:
+        self.calls += 1
+        if not self.healthy:
+            raise ConnectionError("ollama down")
+        return " tamam "
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    clock = [1000.0]
+    adapter = FlakyAdapter()
+    monkeypatch.setattr(server, "get_adapter", lambda: adapter)
+    monkeypatch.setattr(server.time, "time", lambda: clock[0])
+    monkeypatch.setattr(server, "_llm_cb", {"failures": 0, "open_until": 0.0})
+    return adapter, clock
+
+
+def _generate() -> str | None:
+    return asyncio.run(server._llm_generate("p", max_retries=1))
+
+
+def test_trip_cooldown_and_recovery(breaker):
+    adapter, clock = breaker
+
+    # Eşiğe kadar her çağrı adapter'a gider
+    for _ in range(server._LLM_CB_THRESHOLD):
+        assert _generate() is None
+    assert adapter.calls == server._LLM_CB_THRESHOLD
+    assert server._llm_cb["open_until"] == clock[0] + server._LLM_CB_COOLDOWN
+
+    # Açık: cooldown boyunca adapter hiç çağrılmaz
+    clock[0] += server._LLM_CB_COOLDOWN - 1
+    assert _generate() is None
+    assert adapter.calls == server._LLM_CB_THRESHOLD
+
+    # Yarı açık: tek başarısız deneme devreyi hemen tekrar açar
+    clock[0] += 1
+    assert _generate() is None
+    assert adapter.calls == server._LLM_CB_THRESHOLD + 1
+    assert server._llm_cb["open_until"] == clock[0] + server._LLM_CB_COOLDOWN
+
+    # Cooldown sonrası başarılı deneme devreyi kapatır ve sayacı sıfırlar
+    clock[0] += server._LLM_CB_COOLDOWN
+    adapter.healthy = True
+    assert _generate() == "tamam"
+    assert server._llm_cb["failures"] == 0
+
+    # Kapalı: sonraki tek hata devreyi açmaz
+    adapter.healthy = False
+    calls = adapter.calls
+    assert _generate() is None
+    assert server._llm_cb["failures"] == 1
+    assert _generate() is None
+    assert adapter.calls == calls + 2
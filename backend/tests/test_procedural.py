@@ -0,0 +1,76 @@
+"""ProceduralMemory — FTS5 içerik araması."""
+import sqlite3
+
+import pytest
+
+from subconscious.core.types import MemoryRecord
+from subconscious.memory.procedural import ProceduralMemory
+
+
+@pytest.fixture
+def memory(tmp_path):
+    mem = ProceduralMemory(str(tmp_path / "procedural.db"))
+    if not mem._fts:
+        pytest.skip("SQLite FTS5 yok")
+    return mem
+
+
+def _ids(records):
+    return sorted(r.memory_id for r in records)
+
+
+def test_search_follows_update_and_delete(memory):
+    retry = MemoryRecord(memory_id="retry", content="Exponential backoff ile yeniden dene")
+    cache = MemoryRecord(memory_id="cache", content="Sonuçları LRU cache ile sakla")
+    memory.store_many([retry, cache])
+
+    assert _ids(memory.search_content("backoff")) == ["retry"]
+    assert _ids(memory.search_content("CACHE")) == ["cache"]
+
+    # İçerik güncellemesi: eski metin bulunmaz, yenisi bulunur
+    memory.store(MemoryRecord(memory_id="retry", content="Circuit breaker ile cache'i koru"))
+    assert memory.search_content("backoff") == []
+    assert _ids(memory.search_content("cache")) == ["cache", "retry"]
+
+    # Satır silme: indeksten de düşer
+    conn = memory._get_conn()
+    conn.execute("DELETE FROM procedures WHERE memory_id = ?", ("cache",))
+    conn.commit()
+    assert _ids(memory.search_content("cache")) == ["retry"]
+
+    memory.clear()
+    assert memory.search_content("breaker") == []
+
+
+def test_reinforce_keeps_index(memory):
+    memory.store(MemoryRecord(memory_id="p1", content="Batch insert ile yaz"))
+    memory.reinforce("p1")
+    memory.reinforce("p1", success=False)
+    assert _ids(memory.search_content("batch")) == ["p1"]
+
+
+def test_short_query_falls_back_to_like(memory):
+    memory.store(MemoryRecord(memory_id="p1", content="SQL indeksi"))
+    assert _ids(memory.search_content("sq")) == ["p1"]
+
+
+def test_legacy_fts_table_is_rebuilt(tmp_path):
+    path = str(tmp_path / "procedural.db")
+    ProceduralMemory(path).store(MemoryRecord(memory_id="old", content="Eski kalıp"))
+
+    # memory_id ile eşleşen eski bağımsız FTS şeması
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        DROP TRIGGER procedures_fts_ai;
+        DROP TRIGGER procedures_fts_ad;
+        DROP TRIGGER procedures_fts_au;
+        DROP TABLE procedures_fts;
+        CREATE VIRTUAL TABLE procedures_fts
+        USING fts5(content, memory_id UNINDEXED, tokenize='trigram');
+    """)
+    conn.close()
+
+    memory = ProceduralMemory(path)
+    if not memory._fts:
+        pytest.skip("SQLite FTS5 yok")
+    assert _ids(memory.search_content("kalıp")) == ["old"]
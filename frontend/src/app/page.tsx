@@ -6,13 +6,27 @@ import { Sparkles, Terminal, ArrowRight, MessageSquare, Network, MessageCircle,
 
 // Types
 type WebMessage = {
-  type: "chat_response" | "whisper" | "dream" | "graph_init" | "graph_update" | "session_created" | "session_history";
+  type: "chat_response" | "chat_delta" | "whisper" | "dream" | "graph_init" | "graph_update" | "session_created" | "session_history";
   content?: string;
   meta?: any;
   data?: any;
   session_id?: string;
 };
 
+// Graph frames encode rows as arrays:
+//   node: [id, type, activation, importance, domain, is_recent]
+//   edge: [source, target, key, weight, type]
+const decodeNode = (r: any[]) => ({
+  id: r[0],
+  type: r[1],
+  activation: r[2],
+  importance: r[3],
+  domain: r[4],
+  is_recent: r[5],
+});
+const decodeEdge = (r: any[]) => ({ source: r[0], target: r[1], key: r[2], weight: r[3], type: r[4] });
+const edgeId = (r: any[]) => `${r[0]}|${r[1]}|${r[2]}`;
+
 type ChatSession = {
   id: string;
   title: string;
@@ -118,6 +132,11 @@ export default function Home() {
   const thoughtsBottomRef = useRef<HTMLDivElement>(null);
   const svgRef = useRef<SVGSVGElement>(null);
   const simulationRef = useRef<any>(null);
+  const streamingIdRef = useRef<string | null>(null); // assistant message receiving chat_delta chunks
+  // Graph store: rows by id + version of the last applied graph frame (-1 = waiting for graph_init)
+  const graphNodesRef = useRef<Map<string, any>>(new Map());
+  const graphEdgesRef = useRef<Map<string, any>>(new Map());
+  const graphVersionRef = useRef(-1);
 
   // Connection Management
   useEffect(() => {
@@ -130,6 +149,7 @@ export default function Home() {
       socket = new WebSocket(wsUrl);
 
       socket.onopen = () => {
+        graphVersionRef.current = -1;
         setIsConnected(true);
         setStats("Subconscious active");
         setMessages((prev) => [
@@ -152,7 +172,7 @@ export default function Home() {
       socket.onmessage = (event) => {
         try {
           const data: WebMessage = JSON.parse(event.data);
-          handleWebMessage(data);
+          handleWebMessage(data, socket);
         } catch (e) {
           console.error("Error parsing message", e);
         }
@@ -169,7 +189,16 @@ export default function Home() {
     };
   }, []);
 
-  const handleWebMessage = (data: WebMessage) => {
+  const publishGraph = () => {
+    const next = {
+      nodes: Array.from(graphNodesRef.current.values()),
+      edges: Array.from(graphEdgesRef.current.values()),
+    };
+    setGraphData(next);
+    updateStatsFromData(next);
+  };
+
+  const handleWebMessage = (data: WebMessage, socket: WebSocket) => {
     const time = new Date().toLocaleTimeString("tr-TR", {
       hour: "2-digit",
       minute: "2-digit",
@@ -177,19 +206,48 @@ export default function Home() {
     const id = Date.now().toString() + Math.random().toString(36).substr(2, 5);
 
     switch (data.type) {
-      case "chat_response":
+      case "chat_delta": {
         setIsTyping(false);
-        setMessages((prev) => [
-          ...prev,
-          {
-            id,
-            role: "assistant",
-            content: data.content || "",
-            meta: data.meta,
-            timestamp: time,
-          },
-        ]);
+        const chunk = data.content || "";
+        const streamId = streamingIdRef.current;
+        if (streamId) {
+          setMessages((prev) =>
+            prev.map((m) => (m.id === streamId ? { ...m, content: m.content + chunk } : m))
+          );
+        } else {
+          streamingIdRef.current = id;
+          setMessages((prev) => [
+            ...prev,
+            { id, role: "assistant", content: chunk, timestamp: time },
+          ]);
+        }
+        break;
+      }
+      case "chat_response": {
+        setIsTyping(false);
+        // Final frame: full text + meta; replaces the streamed message if any
+        const streamId = streamingIdRef.current;
+        streamingIdRef.current = null;
+        if (streamId) {
+          setMessages((prev) =>
+            prev.map((m) =>
+              m.id === streamId ? { ...m, content: data.content || m.content, meta: data.meta } : m
+            )
+          );
+        } else {
+          setMessages((prev) => [
+            ...prev,
+            {
+              id,
+              role: "assistant",
+              content: data.content || "",
+              meta: data.meta,
+              timestamp: time,
+            },
+          ]);
+        }
         break;
+      }
       case "whisper":
         setMessages((prev) => [
           ...prev,
@@ -227,12 +285,30 @@ export default function Home() {
         });
         break;
       case "graph_init":
-      case "graph_update":
         if (data.data) {
-          setGraphData(data.data);
-          updateStatsFromData(data.data);
+          graphNodesRef.current = new Map(data.data.nodes.map((r: any[]) => [r[0], decodeNode(r)]));
+          graphEdgesRef.current = new Map(data.data.edges.map((r: any[]) => [edgeId(r), decodeEdge(r)]));
+          graphVersionRef.current = data.data.version;
+          publishGraph();
         }
         break;
+      case "graph_update": {
+        const delta = data.data;
+        // Waiting for graph_init, or already covered by a newer snapshot
+        if (!delta || graphVersionRef.current < 0 || delta.version <= graphVersionRef.current) break;
+        if (delta.base !== graphVersionRef.current) {
+          // Missed a delta: ask for a full snapshot
+          socket.send(JSON.stringify({ type: "graph_sync" }));
+          break;
+        }
+        for (const r of delta.nodes) graphNodesRef.current.set(r[0], decodeNode(r));
+        for (const id of delta.removed_nodes) graphNodesRef.current.delete(id);
+        for (const r of delta.edges) graphEdgesRef.current.set(edgeId(r), decodeEdge(r));
+        for (const r of delta.removed_edges) graphEdgesRef.current.delete(edgeId(r));
+        graphVersionRef.current = delta.version;
+        publishGraph();
+        break;
+      }
       case "session_created":
         if (data.session_id && !activeSessionId) {
           setActiveSessionId(data.session_id);